@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+EXPLORADOR INTERACTIVO DE CLÚSTERES (WebGL) - TESIS DOCTORAL
+=============================================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Sustituye a las celdas `px.scatter` / `px.scatter_3d` del notebook, que
+generan un punto SVG por documento e incrustan título y abstract completos en
+`hover_data`. El explorador se construye a partir de la proyección y las
+etiquetas cacheadas (`save_projection`) y escribe un directorio:
+
+    index.html        página con plotly.js (trazas WebGL: scattergl)
+    manifest.json     límites, mapa de densidad global y conteo por tesela
+    tiles/t_<i>_<j>.bin   puntos de cada tesela espacial (x, y, clúster, doc id)
+    hover/<k>.json    texto de hover, fragmentado por doc id
+
+Con zoom bajo se muestra solo el mapa de densidad (heatmap agregado); cuando
+la vista contiene menos de `max_points` documentos se cargan bajo demanda las
+teselas visibles como puntos WebGL. El texto de hover se pide al fragmento
+correspondiente solo al pasar el cursor sobre un punto, así que el HTML no
+contiene ningún título ni abstract.
+
+El explorador es solo 2D: de una proyección con más columnas (la 3D de
+`px.scatter_3d`) se usan las dos primeras, con un aviso. Las etiquetas
+negativas (p. ej. -1 de HDBSCAN) se agrupan en un clúster "Ruido".
+
+Al usar fetch(), el directorio debe servirse por HTTP:
+    python -m http.server --directory explorer/
+
+Uso:
+    python scripts/cluster_explorer.py projection.npz explorer/ --hover abstract_by_cluster.csv
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import html
+import json
+import os
+import warnings
+
+import numpy as np
+
+DENSITY_GRID = 256
+TILE_GRID = 32
+MAX_POINTS = 200_000
+HOVER_SHARD_SIZE = 1000
+HOVER_COLUMNS = ['Title', 'Year']
+PLOTLY_JS = 'https://cdn.plot.ly/plotly-2.35.2.min.js'
+NOISE_NAME = 'Ruido'
+
+# Registro binario de cada punto en las teselas
+POINT_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('cluster', '<u2'), ('doc_id', '<u4')])
+
+
+# =============================================================================
+# CACHÉ DE LA PROYECCIÓN
+# =============================================================================
+def _as_2d(xy):
+    """Proyección n x 2; de una 3D (o más) se conservan las dos primeras columnas."""
+    xy = np.asarray(xy, dtype=np.float32)
+    if xy.ndim != 2 or xy.shape[1] < 2:
+        raise ValueError(f"Se esperaba una proyección n x 2, no {xy.shape}")
+    if xy.shape[1] > 2:
+        warnings.warn(f"El explorador es 2D: se descartan {xy.shape[1] - 2} columnas "
+                      f"de la proyección", UserWarning, stacklevel=3)
+    return xy[:, :2]
+
+
+def save_projection(path, xy, labels, doc_ids=None):
+    """
+    Guarda la proyección 2D (PCA/t-SNE/UMAP) y las etiquetas de clúster.
+    Solo se guardan las dos primeras columnas de `xy`.
+    """
+    xy = _as_2d(xy)
+    labels = np.asarray(labels, dtype=np.int64)
+    if doc_ids is None:
+        doc_ids = np.arange(len(xy))
+    np.savez(path, xy=xy, labels=labels, doc_ids=np.asarray(doc_ids, dtype=np.int64))
+
+
+def load_projection(path):
+    """Carga la proyección guardada con `save_projection`."""
+    with np.load(path) as data:
+        return data['xy'], data['labels'], data['doc_ids']
+
+
+# =============================================================================
+# CONSTRUCCIÓN DEL EXPLORADOR
+# =============================================================================
+def _grid_codes(xy, bounds, size):
+    """Celda (i, j) de cada punto en una rejilla size x size sobre bounds."""
+    x0, x1, y0, y1 = bounds
+    span_x = (x1 - x0) or 1.0
+    span_y = (y1 - y0) or 1.0
+    i = np.clip(((xy[:, 0] - x0) / span_x * size).astype(np.int64), 0, size - 1)
+    j = np.clip(((xy[:, 1] - y0) / span_y * size).astype(np.int64), 0, size - 1)
+    return i, j
+
+
+def density_grid(xy, bounds, size=DENSITY_GRID):
+    """Conteo de documentos por celda (filas = y, columnas = x) vía bincount."""
+    i, j = _grid_codes(xy, bounds, size)
+    return np.bincount(j * size + i, minlength=size * size).reshape(size, size)
+
+
+def _write_tiles(out_dir, xy, labels, doc_ids, bounds, tile_grid):
+    """Escribe los puntos agrupados por tesela; devuelve {"i_j": conteo}."""
+    tiles_dir = os.path.join(out_dir, 'tiles')
+    os.makedirs(tiles_dir, exist_ok=True)
+    i, j = _grid_codes(xy, bounds, tile_grid)
+    tile = i * tile_grid + j
+    order = np.argsort(tile, kind='stable')
+    tile_sorted = tile[order]
+    starts = np.flatnonzero(np.r_[True, tile_sorted[1:] != tile_sorted[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+
+    records = np.empty(len(order), dtype=POINT_DTYPE)
+    records['x'] = xy[order, 0]
+    records['y'] = xy[order, 1]
+    records['cluster'] = labels[order]
+    records['doc_id'] = doc_ids[order]
+
+    counts = {}
+    for s, e in zip(starts, ends):
+        ti, tj = divmod(int(tile_sorted[s]), tile_grid)
+        records[s:e].tofile(os.path.join(tiles_dir, f't_{ti}_{tj}.bin'))
+        counts[f'{ti}_{tj}'] = int(e - s)
+    return counts
+
+
+def _write_hover(out_dir, hover, doc_ids, shard_size):
+    """Fragmentos JSON {doc_id: registro} con shard = doc_id // shard_size."""
+    hover_dir = os.path.join(out_dir, 'hover')
+    os.makedirs(hover_dir, exist_ok=True)
+    columns = list(hover.columns)
+    shard = doc_ids // shard_size
+    order = np.argsort(shard, kind='stable')
+    shard_sorted = shard[order]
+    starts = np.flatnonzero(np.r_[True, shard_sorted[1:] != shard_sorted[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    values = hover.astype(str).to_numpy(dtype=object)
+    missing = hover.isna().to_numpy()
+    values[missing] = None
+    for s, e in zip(starts, ends):
+        rows = order[s:e]
+        payload = {int(doc_ids[r]): values[r].tolist() for r in rows}
+        with open(os.path.join(hover_dir, f'{int(shard_sorted[s])}.json'), 'w',
+                  encoding='utf-8') as f:
+            json.dump({'columns': columns, 'rows': payload}, f, ensure_ascii=False)
+
+
+def build_explorer(xy, labels, out_dir, doc_ids=None, hover=None, cluster_names=None,
+                   density_size=DENSITY_GRID, tile_grid=TILE_GRID, max_points=MAX_POINTS,
+                   shard_size=HOVER_SHARD_SIZE, title='Clústeres temáticos'):
+    """
+    Genera el explorador interactivo en out_dir.
+
+    xy:            proyección 2D (n x 2); columnas adicionales se descartan
+    labels:        clúster de cada documento; los negativos (ruido de
+                   HDBSCAN) forman un clúster adicional "Ruido"
+    hover:         DataFrame (n filas, mismo orden) con las columnas a mostrar
+                   al pasar el cursor; por defecto no se incluye el abstract
+    cluster_names: nombres de los clústeres (p. ej. CLUSTER_DATA['names'])
+    """
+    xy = _as_2d(xy)
+    labels = np.asarray(labels, dtype=np.int64)
+    doc_ids = np.arange(len(xy)) if doc_ids is None else np.asarray(doc_ids, dtype=np.int64)
+    os.makedirs(out_dir, exist_ok=True)
+
+    x0, y0 = (xy.min(axis=0).tolist() if len(xy) else [0.0, 0.0])
+    x1, y1 = (xy.max(axis=0).tolist() if len(xy) else [1.0, 1.0])
+    bounds = (x0, x1, y0, y1)
+
+    noise = labels < 0
+    n_clusters = int(labels[~noise].max()) + 1 if (~noise).any() else 0
+    if cluster_names is None:
+        cluster_names = [f'Cluster {c}' for c in range(n_clusters)]
+    if noise.any():
+        labels = np.where(noise, n_clusters, labels)
+        cluster_names = list(cluster_names[:n_clusters]) + [NOISE_NAME]
+        n_clusters += 1
+    sizes = np.bincount(labels, minlength=n_clusters)
+    centroids = np.zeros((n_clusters, 2))
+    for axis in (0, 1):
+        centroids[:, axis] = np.bincount(labels, weights=xy[:, axis], minlength=n_clusters)
+    centroids /= np.maximum(sizes, 1)[:, None]
+
+    tile_counts = _write_tiles(out_dir, xy, labels, doc_ids, bounds, tile_grid)
+    if hover is not None:
+        _write_hover(out_dir, hover, doc_ids, shard_size)
+
+    manifest = {
+        'title': title,
+        'n_points': int(len(xy)),
+        'bounds': list(bounds),
+        'density_size': density_size,
+        'density': density_grid(xy, bounds, density_size).tolist(),
+        'tile_grid': tile_grid,
+        'tiles': tile_counts,
+        'max_points': max_points,
+        'shard_size': shard_size if hover is not None else None,
+        'clusters': [{'id': c, 'name': str(cluster_names[c]), 'n': int(sizes[c]),
+                      'x': float(centroids[c, 0]), 'y': float(centroids[c, 1])}
+                     for c in range(n_clusters)],
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(_HTML_TEMPLATE.replace('{{PLOTLY_JS}}', PLOTLY_JS)
+                .replace('{{TITLE}}', html.escape(title)))
+    print(f"✓ Explorador guardado: {out_dir} ({len(xy):,} puntos, "
+          f"{len(tile_counts)} teselas)")
+    return out_dir
+
+
+_HTML_TEMPLATE = r"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{TITLE}}</title>
+<script src="{{PLOTLY_JS}}"></script>
+<style>
+  body { margin: 0; font-family: serif; display: flex; height: 100vh; }
+  #plot { flex: 1; }
+  #info { width: 320px; padding: 12px; overflow-y: auto; border-left: 1px solid #ddd; font-size: 13px; }
+  #status { color: #666; margin-bottom: 8px; }
+</style>
+</head>
+<body>
+<div id="plot"></div>
+<div id="info"><div id="status"></div><div id="hover">Pasa el cursor sobre un punto.</div></div>
+<script>
+(async function () {
+  const M = await (await fetch('manifest.json')).json();
+  const [x0, x1, y0, y1] = M.bounds;
+  const G = M.density_size, T = M.tile_grid;
+  const spanX = (x1 - x0) || 1, spanY = (y1 - y0) || 1;
+  const tileCache = new Map(), shardCache = new Map();
+  const plot = document.getElementById('plot');
+
+  const axis = (a, b, n) => Array.from({length: n}, (_, k) => a + (k + 0.5) * (b - a) / n);
+  const density = {
+    type: 'heatmap', x: axis(x0, x1, G), y: axis(y0, y1, G),
+    z: M.density.map(r => r.map(v => v > 0 ? Math.log10(v + 1) : null)),
+    colorscale: 'Viridis', showscale: false, hoverinfo: 'skip', name: 'densidad'
+  };
+  const centroids = {
+    type: 'scattergl', mode: 'markers+text', name: 'clústeres',
+    x: M.clusters.map(c => c.x), y: M.clusters.map(c => c.y),
+    text: M.clusters.map(c => c.name), textposition: 'top center',
+    marker: {size: 9, color: 'black', symbol: 'x'}, hoverinfo: 'text'
+  };
+  const points = {
+    type: 'scattergl', mode: 'markers', name: 'documentos', x: [], y: [], customdata: [],
+    marker: {size: 3, color: [], colorscale: 'Portland', cmin: 0,
+             cmax: Math.max(M.clusters.length - 1, 1), opacity: 0.7},
+    hoverinfo: 'none'
+  };
+  await Plotly.newPlot(plot, [density, points, centroids], {
+    title: M.title, showlegend: false, hovermode: 'closest',
+    xaxis: {range: [x0, x1]}, yaxis: {range: [y0, y1]}, margin: {t: 40}
+  }, {responsive: true, scrollZoom: true});
+
+  function visibleTiles(xr, yr) {
+    const clamp = v => Math.min(T - 1, Math.max(0, v));
+    const i0 = clamp(Math.floor((xr[0] - x0) / spanX * T)), i1 = clamp(Math.floor((xr[1] - x0) / spanX * T));
+    const j0 = clamp(Math.floor((yr[0] - y0) / spanY * T)), j1 = clamp(Math.floor((yr[1] - y0) / spanY * T));
+    const keys = [];
+    for (let i = i0; i <= i1; i++) for (let j = j0; j <= j1; j++) {
+      if (M.tiles[i + '_' + j]) keys.push(i + '_' + j);
+    }
+    return keys;
+  }
+
+  async function loadTile(key) {
+    if (!tileCache.has(key)) {
+      const buf = await (await fetch('tiles/t_' + key + '.bin')).arrayBuffer();
+      const view = new DataView(buf), n = buf.byteLength / 14;
+      const t = {x: new Float32Array(n), y: new Float32Array(n),
+                 c: new Uint16Array(n), id: new Uint32Array(n)};
+      for (let k = 0, o = 0; k < n; k++, o += 14) {
+        t.x[k] = view.getFloat32(o, true); t.y[k] = view.getFloat32(o + 4, true);
+        t.c[k] = view.getUint16(o + 8, true); t.id[k] = view.getUint32(o + 10, true);
+      }
+      tileCache.set(key, t);
+    }
+    return tileCache.get(key);
+  }
+
+  // plotly_relayout dispara refresh() sin esperar a la llamada anterior:
+  // cada llamada toma un número y solo la más reciente redibuja los puntos
+  let refreshSeq = 0;
+
+  async function refresh() {
+    const seq = ++refreshSeq;
+    const L = plot.layout, xr = L.xaxis.range, yr = L.yaxis.range;
+    const keys = visibleTiles(xr, yr);
+    const n = keys.reduce((s, k) => s + M.tiles[k], 0);
+    const status = document.getElementById('status');
+    if (keys.length === 0) {
+      status.textContent = 'Sin documentos en la vista';
+      Plotly.restyle(plot, {x: [[]], y: [[]], customdata: [[]], 'marker.color': [[]]}, [1]);
+      Plotly.restyle(plot, {opacity: 1}, [0]);
+      return;
+    }
+    if (n > M.max_points) {
+      status.textContent = 'Vista de densidad (' + n.toLocaleString() + ' documentos visibles)';
+      Plotly.restyle(plot, {x: [[]], y: [[]], customdata: [[]], 'marker.color': [[]]}, [1]);
+      Plotly.restyle(plot, {opacity: 1}, [0]);
+      return;
+    }
+    const tiles = await Promise.all(keys.map(loadTile));
+    if (seq !== refreshSeq) return;  // la vista cambió mientras se cargaban
+    const cat = f => {
+      const out = new tiles[0][f].constructor(n);
+      let o = 0;
+      tiles.forEach(t => { out.set(t[f], o); o += t[f].length; });
+      return Array.from(out);
+    };
+    status.textContent = n.toLocaleString() + ' documentos visibles';
+    Plotly.restyle(plot, {x: [cat('x')], y: [cat('y')], customdata: [cat('id')],
+                          'marker.color': [cat('c')]}, [1]);
+    Plotly.restyle(plot, {opacity: 0.25}, [0]);
+  }
+
+  async function showHover(docId) {
+    const box = document.getElementById('hover');
+    if (M.shard_size === null) { box.textContent = 'Documento ' + docId; return; }
+    const s = Math.floor(docId / M.shard_size);
+    if (!shardCache.has(s)) shardCache.set(s, (await fetch('hover/' + s + '.json')).json());
+    const shard = await shardCache.get(s), row = shard.rows[docId] || [];
+    box.innerHTML = '<b>Documento ' + docId + '</b>' + shard.columns.map((c, k) =>
+      '<p><b>' + c + ':</b> ' + String(row[k] ?? '').replace(/</g, '&lt;') + '</p>').join('');
+  }
+
+  plot.on('plotly_relayout', refresh);
+  plot.on('plotly_hover', ev => {
+    const p = ev.points[0];
+    if (p.curveNumber === 1) showHover(p.customdata);
+  });
+  refresh();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+# =============================================================================
+# EJECUCIÓN PRINCIPAL
+# =============================================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Explorador interactivo de clústeres')
+    parser.add_argument('projection', help='Archivo .npz generado con save_projection')
+    parser.add_argument('output')
+    parser.add_argument('--hover', help='CSV con el texto de hover (mismo orden)')
+    parser.add_argument('--hover-cols', nargs='+', default=HOVER_COLUMNS)
+    parser.add_argument('--max-points', type=int, default=MAX_POINTS)
+    args = parser.parse_args()
+
+    xy, labels, doc_ids = load_projection(args.projection)
+    hover = None
+    if args.hover:
+        import pandas as pd
+        hover = pd.read_csv(args.hover, usecols=args.hover_cols)[args.hover_cols]
+    build_explorer(xy, labels, args.output, doc_ids=doc_ids, hover=hover,
+                   max_points=args.max_points)
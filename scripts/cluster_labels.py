@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+ETIQUETADO AUTOMÁTICO DE CLÚSTERES - TESIS DOCTORAL
+====================================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Los nombres de `CLUSTER_DATA['names']` ("NLP & LLMs", "CT Radiomics", ...)
+se asignaron a mano leyendo la salida de
+`kmeans_best_result.cluster_centers_.argsort()`, que solo muestra stems
+sueltos. Este módulo propone etiquetas candidatas en una sola pasada sobre
+el corpus normalizado (sin volver a tokenizar):
+
+- c-TF-IDF (TF-IDF basado en clases) de unigramas y de bigramas
+  adyacentes, con las matrices clúster × término obtenidas como producto
+  disperso (one-hot de clúster) @ (documento × término);
+- traducción de stems a su forma superficial más frecuente usando la caché
+  construida en `text_processing.normalize_corpus(..., surface_forms)`;
+- escritura de las etiquetas junto a la tabla de asignaciones.
+
+Uso:
+    python scripts/cluster_labels.py corpus_normalizado.csv --forms formas.json
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import json
+import os
+from itertools import chain
+
+import numpy as np
+
+TOP_TERMS = 10
+TOP_BIGRAMS = 5
+MIN_BIGRAM_COUNT = 3
+
+
+# =============================================================================
+# MATRICES DISPERSAS
+# =============================================================================
+def _token_stream(corpus):
+    """
+    Ids de término de todos los tokens (en orden) y documento de cada uno.
+    El corpus es la salida de normalizeCorpus: tokens ya separados por espacio,
+    así que basta con split(); los ids se asignan con pd.factorize (hash).
+    """
+    import pandas as pd
+
+    docs = [d.split() if isinstance(d, str) else list(d) for d in corpus]
+    doc_len = np.fromiter((len(d) for d in docs), dtype=np.int64, count=len(docs))
+    term_col, terms = pd.factorize(pd.Series(list(chain.from_iterable(docs)), dtype=object))
+    doc_col = np.repeat(np.arange(len(docs), dtype=np.int64), doc_len)
+    return term_col.astype(np.int64), doc_col, np.asarray(terms, dtype=object)
+
+
+def _counts_matrix(doc_col, col, n_docs, n_cols):
+    """
+    Matriz dispersa documento × columna con un 1 por token. doc_col ya viene
+    ordenado, así que el CSR se arma directamente (sin ordenar índices); el
+    producto disperso posterior acumula los duplicados.
+    """
+    from scipy import sparse
+    indptr = np.zeros(n_docs + 1, dtype=np.int64)
+    np.cumsum(np.bincount(doc_col, minlength=n_docs), out=indptr[1:])
+    data = np.ones(len(col), dtype=np.float64)
+    return sparse.csr_matrix((data, col, indptr), shape=(n_docs, n_cols))
+
+
+def _cluster_onehot(labels, n_clusters):
+    """Matriz dispersa clúster × documento (one-hot de la asignación)."""
+    from scipy import sparse
+    n_docs = len(labels)
+    data = np.ones(n_docs, dtype=np.float64)
+    return sparse.csr_matrix((data, (labels, np.arange(n_docs))), shape=(n_clusters, n_docs))
+
+
+def class_tfidf(cluster_term):
+    """
+    c-TF-IDF: W(t, c) = tf(t, c) / |c| * log(1 + A / f(t)), con A el número
+    medio de tokens por clúster y f(t) la frecuencia total del término.
+    Conserva la estructura dispersa de la entrada (mismo orden de `data`).
+    """
+    from scipy import sparse
+    cluster_term = sparse.csr_matrix(cluster_term, dtype=np.float64)
+    sizes = np.asarray(cluster_term.sum(axis=1)).ravel()
+    freq = np.asarray(cluster_term.sum(axis=0)).ravel()
+    avg = sizes.sum() / max(len(sizes), 1)
+    idf = np.log1p(avg / np.maximum(freq, 1))
+    rows = np.repeat(np.arange(len(sizes)), np.diff(cluster_term.indptr))
+    weights = cluster_term.copy()
+    weights.data = cluster_term.data / np.maximum(sizes, 1)[rows] * idf[cluster_term.indices]
+    return weights
+
+
+def _top_per_row(matrix, n):
+    """Índices de columna con mayor peso en cada fila de una matriz CSR."""
+    tops = []
+    for r in range(matrix.shape[0]):
+        start, end = matrix.indptr[r], matrix.indptr[r + 1]
+        cols = matrix.indices[start:end]
+        vals = matrix.data[start:end]
+        if len(vals) > n:
+            part = np.argpartition(-vals, n - 1)[:n]
+            cols, vals = cols[part], vals[part]
+        order = np.lexsort((cols, -vals))
+        tops.append((cols[order], vals[order]))
+    return tops
+
+
+# =============================================================================
+# ETIQUETAS
+# =============================================================================
+def cluster_keywords(corpus, labels, n_clusters=None, top_terms=TOP_TERMS,
+                     top_bigrams=TOP_BIGRAMS, min_bigram_count=MIN_BIGRAM_COUNT):
+    """
+    Términos y bigramas más representativos de cada clúster (c-TF-IDF).
+
+    corpus: salida de normalizeCorpus (mismo orden que labels)
+    labels: clúster de cada documento (kmeans_best_result.labels_)
+    Devuelve una lista (uno por clúster) de dicts con 'terms' y 'bigrams',
+    cada uno como lista de (stem(s), peso).
+    """
+    import pandas as pd
+
+    labels = np.asarray(labels, dtype=np.int64)
+    if n_clusters is None:
+        n_clusters = int(labels.max()) + 1 if len(labels) else 0
+    term_col, doc_col, terms = _token_stream(corpus)
+    n_docs, n_terms = len(labels), len(terms)
+    onehot = _cluster_onehot(labels, n_clusters)
+
+    # Unigramas: (clúster × doc) @ (doc × término)
+    cluster_term = onehot @ _counts_matrix(doc_col, term_col, n_docs, n_terms)
+    uni = _top_per_row(class_tfidf(cluster_term), top_terms)
+
+    # Bigramas adyacentes dentro del mismo documento, codificados como
+    # primer_id * V + segundo_id y compactados con pd.factorize
+    same_doc = doc_col[1:] == doc_col[:-1]
+    pair = term_col[:-1][same_doc] * n_terms + term_col[1:][same_doc]
+    pair_doc = doc_col[1:][same_doc]
+    pair_col, pair_keys = pd.factorize(pair)
+    cluster_pair = onehot @ _counts_matrix(pair_doc, pair_col, n_docs, len(pair_keys))
+    # Descarta bigramas poco frecuentes dentro del clúster
+    bigram_weights = class_tfidf(cluster_pair)
+    bigram_weights.data[cluster_pair.data < min_bigram_count] = 0
+    bigram_weights.eliminate_zeros()
+    bi = _top_per_row(bigram_weights, top_bigrams)
+
+    result = []
+    for c in range(n_clusters):
+        cols, vals = uni[c]
+        bcols, bvals = bi[c]
+        first, second = np.divmod(pair_keys[bcols], n_terms) if len(bcols) else ([], [])
+        result.append({
+            'terms': [(terms[t], float(w)) for t, w in zip(cols, vals)],
+            'bigrams': [((terms[a], terms[b]), float(w))
+                        for a, b, w in zip(first, second, bvals)],
+        })
+    return result
+
+
+def surface(stem, forms):
+    """Forma superficial más frecuente de un stem (o el stem si no se conoce)."""
+    return forms.get(stem, stem) if forms else stem
+
+
+def candidate_labels(keywords, forms=None, n_label=2):
+    """
+    Tabla de etiquetas candidatas por clúster.
+
+    forms: {stem: forma superficial} (text_processing.most_frequent_forms)
+    La etiqueta son los `n_label` bigramas principales; si el clúster no tiene
+    bigramas frecuentes se usan los unigramas.
+    """
+    import pandas as pd
+
+    rows = []
+    for c, kw in enumerate(keywords):
+        terms = [surface(t, forms) for t, _ in kw['terms']]
+        bigrams = [f'{surface(a, forms)} {surface(b, forms)}' for (a, b), _ in kw['bigrams']]
+        label = ' / '.join(bigrams[:n_label]) if bigrams else ', '.join(terms[:3])
+        rows.append({'cluster': c, 'candidate_label': label,
+                     'top_terms': '; '.join(terms), 'top_bigrams': '; '.join(bigrams)})
+    return pd.DataFrame(rows)
+
+
+def attach_labels(assignments, labels_table, cluster_col='Cluster'):
+    """Añade la columna candidate_label a la tabla de asignaciones."""
+    mapping = labels_table.set_index('cluster')['candidate_label']
+    out = assignments.copy()
+    out['candidate_label'] = out[cluster_col].map(mapping)
+    return out
+
+
+def save_surface_forms(path, forms):
+    """Guarda {stem: forma superficial} como JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(forms, f, ensure_ascii=False)
+
+
+def load_surface_forms(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# =============================================================================
+# EJECUCIÓN PRINCIPAL
+# =============================================================================
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Etiquetas candidatas por clúster')
+    parser.add_argument('assignments', help='CSV con el corpus normalizado y el clúster')
+    parser.add_argument('--text-col', default='corpus')
+    parser.add_argument('--cluster-col', default='Cluster')
+    parser.add_argument('--forms', help='JSON {stem: forma} (save_surface_forms)')
+    parser.add_argument('--output', help='CSV de salida (por defecto <entrada>_labels.csv)')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.assignments)
+    forms = load_surface_forms(args.forms) if args.forms else None
+    keywords = cluster_keywords(df[args.text_col].fillna('').tolist(), df[args.cluster_col])
+    table = candidate_labels(keywords, forms)
+
+    base, _ = os.path.splitext(args.assignments)
+    output = args.output or base + '_labels.csv'
+    table.to_csv(output, index=False)
+    attach_labels(df, table, args.cluster_col).to_csv(base + '_labeled.csv', index=False)
+    print(table[['cluster', 'candidate_label']].to_string(index=False))
+    print(f"✓ Etiquetas guardadas: {output}")
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+EXPORTACIÓN DE RESULTADOS POR CLÚSTER - TESIS DOCTORAL
+=======================================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Sustituye a `df_final.to_excel('abstract_by_cluster.xlsx')` y
+`most_dominant_articles.to_excel(...)` del notebook, que construyen todo el
+libro en memoria con openpyxl:
+
+- xlsx en streaming: cada fila se escribe directamente en la entrada del
+  zip con cadenas en línea (sin tabla de strings compartidos), por lo que la
+  memoria es constante con independencia del número de filas.
+- Parquet y CSV.gz particionados por clúster y año (estilo Hive:
+  `Cluster=7/Year=2024/part-0.parquet`), para que los scripts de figuras y
+  otras herramientas lean solo la partición que necesitan
+  (`read_partition`). Las filas sin clúster o sin año van a la partición
+  `Cluster=__null__` / `Year=__null__`.
+
+Uso:
+    python scripts/export_results.py abstract_by_cluster.csv exports/ --formats xlsx parquet csv
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import glob
+import math
+import numbers
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+# Límite de caracteres por celda en Excel
+XLSX_MAX_CELL_CHARS = 32767
+PARTITION_COLS = ('Cluster', 'Year')
+# Partición para filas sin clúster o sin año (no se descartan)
+NULL_PARTITION = '__null__'
+
+# Caracteres de control no válidos en XML 1.0
+_RE_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+# =============================================================================
+# XLSX EN STREAMING
+# =============================================================================
+def _cell_xml(value):
+    """XML de una celda (sin referencia: Excel asume columnas consecutivas)."""
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Number):
+        if isinstance(value, float) and not math.isfinite(value):
+            return '<c/>'
+        return f'<c><v>{value}</v></c>'
+    text = _RE_ILLEGAL_XML.sub('', str(value))[:XLSX_MAX_CELL_CHARS]
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def write_xlsx_stream(rows, path, columns=None, sheet_name='Sheet1'):
+    """
+    Escribe un .xlsx fila a fila con memoria constante.
+
+    rows:    iterable de secuencias (p. ej. df.itertuples(index=False))
+    columns: encabezados opcionales (primera fila)
+    Devuelve el número de filas de datos escritas.
+    """
+    n_rows = 0
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=1) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _ROOT_RELS)
+        zf.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31])))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as raw:
+            raw.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                      b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                      b'<sheetData>')
+            if columns is not None:
+                raw.write(('<row>' + ''.join(_cell_xml(c) for c in columns)
+                           + '</row>').encode('utf-8'))
+            for row in rows:
+                raw.write(('<row>' + ''.join(_cell_xml(_scalar(v)) for v in row)
+                           + '</row>').encode('utf-8'))
+                n_rows += 1
+            raw.write(b'</sheetData></worksheet>')
+    return n_rows
+
+
+def _scalar(value):
+    """Convierte escalares de numpy/pandas a tipos de Python (NaN/NaT → None)."""
+    if hasattr(value, 'item') and not isinstance(value, str):
+        try:
+            value = value.item()
+        except (ValueError, TypeError):
+            pass
+    try:
+        if value != value:  # NaN, NaT
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+def export_xlsx(df, path, index=True, sheet_name='Sheet1'):
+    """Equivalente en streaming de `df.to_excel(path, index=index)`."""
+    columns = list(df.columns)
+    if index:
+        columns = [df.index.name or ''] + columns
+        rows = df.itertuples(index=True, name=None)
+    else:
+        rows = df.itertuples(index=False, name=None)
+    n = write_xlsx_stream(rows, path, columns=columns, sheet_name=sheet_name)
+    print(f"✓ xlsx guardado: {path} ({n:,} filas)")
+    return path
+
+
+# =============================================================================
+# EXPORTACIÓN PARTICIONADA (PARQUET / CSV.GZ)
+# =============================================================================
+def _partition_dir(root, keys, values):
+    import pandas as pd
+    parts = [f'{k}={NULL_PARTITION if pd.isna(v) else v}' for k, v in zip(keys, values)]
+    return os.path.join(root, *parts)
+
+
+def _partition_groups(df, partition_cols):
+    """
+    Grupos (valores, filas) por columnas de partición, incluidas las filas
+    con claves nulas. Las claves float enteras (float solo por los NaN) se
+    convierten a Int64 para que la ruta sea `Cluster=1` y no `Cluster=1.0`.
+    """
+    import pandas as pd
+
+    keys = df[partition_cols].copy()
+    for col in partition_cols:
+        values = keys[col]
+        if pd.api.types.is_float_dtype(values):
+            present = values.dropna()
+            if (present == present.round()).all():
+                keys[col] = values.astype('Int64')
+    data = df.drop(columns=partition_cols)
+    groups = keys.groupby(partition_cols, sort=True, dropna=False).indices
+    for values, rows in groups.items():
+        yield (values if isinstance(values, tuple) else (values,)), data.iloc[rows]
+
+
+def _clear_partitions(root):
+    """
+    Borra los archivos part-* de un export anterior en `root` (y los
+    directorios de partición que queden vacíos), para que read_partition no
+    mezcle particiones obsoletas. El resto de archivos de `root` no se toca.
+    """
+    for path in glob.glob(os.path.join(root, '**', 'part-*.*'), recursive=True):
+        if _parse_partition(path, root):
+            os.remove(path)
+    for dirpath, _, _ in os.walk(root, topdown=False):
+        if dirpath != root and '=' in os.path.basename(dirpath) and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+
+def export_parquet(df, root, partition_cols=PARTITION_COLS):
+    """
+    Parquet particionado por clúster y año (requiere pyarrow). Sustituye
+    cualquier export anterior en `root`.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("export_parquet requiere pyarrow: pip install pyarrow") from e
+    partition_cols = list(partition_cols)
+    _clear_partitions(root)
+    for values, part in _partition_groups(df, partition_cols):
+        out_dir = _partition_dir(root, partition_cols, values)
+        os.makedirs(out_dir, exist_ok=True)
+        part.to_parquet(os.path.join(out_dir, 'part-0.parquet'), index=False)
+    print(f"✓ Parquet particionado guardado: {root}")
+    return root
+
+
+def export_csv_gz(df, root, partition_cols=PARTITION_COLS):
+    """
+    CSV comprimido (gzip) particionado por clúster y año. Sustituye
+    cualquier export anterior en `root`.
+    """
+    partition_cols = list(partition_cols)
+    _clear_partitions(root)
+    for values, part in _partition_groups(df, partition_cols):
+        out_dir = _partition_dir(root, partition_cols, values)
+        os.makedirs(out_dir, exist_ok=True)
+        part.to_csv(os.path.join(out_dir, 'part-0.csv.gz'), index=False, compression='gzip')
+    print(f"✓ CSV.gz particionado guardado: {root}")
+    return root
+
+
+def _parse_partition(path, root):
+    """{'Cluster': '7', 'Year': '2024'} a partir de la ruta de un archivo."""
+    rel = os.path.relpath(os.path.dirname(path), root)
+    return dict(p.split('=', 1) for p in rel.split(os.sep) if '=' in p)
+
+
+def read_partition(root, cluster=None, year=None, columns=None):
+    """
+    Lee solo las particiones pedidas (clúster y/o año; escalar o lista) de un
+    export Parquet o CSV.gz y devuelve un DataFrame con las columnas de
+    partición restauradas.
+    """
+    import pandas as pd
+
+    wanted = {}
+    for key, value in zip(PARTITION_COLS, (cluster, year)):
+        if value is not None:
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            wanted[key] = {str(v) for v in values}
+
+    # Las columnas de partición no están en los archivos: salen de la ruta
+    file_columns = None
+    if columns is not None:
+        file_columns = [c for c in columns if c not in PARTITION_COLS]
+
+    frames = []
+    files = sorted(glob.glob(os.path.join(root, '**', 'part-*.*'), recursive=True))
+    for path in files:
+        keys = _parse_partition(path, root)
+        if any(keys.get(k) not in v for k, v in wanted.items()):
+            continue
+        if path.endswith('.parquet'):
+            part = pd.read_parquet(path, columns=file_columns)
+        elif file_columns == []:
+            # Solo claves de partición: basta con el número de filas, pero
+            # read_csv(usecols=[]) no devuelve ninguna
+            part = pd.read_csv(path, usecols=[0]).iloc[:, :0]
+        else:
+            part = pd.read_csv(path, usecols=file_columns)
+        for k, v in keys.items():
+            part[k] = _partition_value(v)
+        frames.append(part)
+    if not frames:
+        return pd.DataFrame(columns=list(file_columns or []) + list(PARTITION_COLS))
+    out = pd.concat(frames, ignore_index=True)
+    for k in PARTITION_COLS:
+        if k in out and out[k].map(lambda v: v is pd.NA or isinstance(v, numbers.Integral)).all():
+            out[k] = out[k].astype('Int64')
+    if columns is not None:
+        out = out[[c for c in columns if c in out]]
+    return out
+
+
+def _partition_value(value):
+    """Valor de una clave de partición leída de la ruta ('7', '__null__', ...)."""
+    import pandas as pd
+    if value == NULL_PARTITION:
+        return pd.NA
+    return int(value) if value.lstrip('-').isdigit() else value
+
+
+# =============================================================================
+# EJECUCIÓN PRINCIPAL
+# =============================================================================
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Exportar asignaciones por clúster')
+    parser.add_argument('input', help='CSV o xlsx con las columnas Cluster y Year')
+    parser.add_argument('output', help='Directorio de salida')
+    parser.add_argument('--formats', nargs='+', default=['xlsx', 'parquet', 'csv'],
+                        choices=['xlsx', 'parquet', 'csv'])
+    args = parser.parse_args()
+
+    if args.input.endswith('.xlsx'):
+        df = pd.read_excel(args.input)
+    else:
+        df = pd.read_csv(args.input)
+    os.makedirs(args.output, exist_ok=True)
+    if 'xlsx' in args.formats:
+        export_xlsx(df, os.path.join(args.output, 'abstract_by_cluster.xlsx'))
+    if 'parquet' in args.formats:
+        export_parquet(df, os.path.join(args.output, 'parquet'))
+    if 'csv' in args.formats:
+        export_csv_gz(df, os.path.join(args.output, 'csv'))
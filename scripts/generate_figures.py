@@ -18,16 +18,12 @@ Autor: Gilberto Objío Subero
 Fecha: Febrero 2026
 """
 
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Para generar sin display
 import numpy as np
 from collections import Counter
 import os
 
 # Configuración de estilo para publicación
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams.update({
+STYLE_RC = {
     'figure.figsize': (10, 6),
     'figure.dpi': 300,
     'savefig.dpi': 300,
@@ -39,14 +35,27 @@ plt.rcParams.update({
     'ytick.labelsize': 11,
     'legend.fontsize': 11,
     'figure.titlesize': 18
-})
+}
 
 # Directorio de salida
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 FIGURES_DIR = os.path.join(OUTPUT_DIR, 'figures_publication')
-os.makedirs(FIGURES_DIR, exist_ok=True)
 
-print(f"📁 Figuras se guardarán en: {FIGURES_DIR}")
+_plt = None
+
+
+def _pyplot():
+    """Importa matplotlib (Agg) y aplica el estilo solo al renderizar la primera figura."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Para generar sin display
+        import matplotlib.pyplot as plt
+        plt.style.use('seaborn-v0_8-whitegrid')
+        plt.rcParams.update(STYLE_RC)
+        os.makedirs(FIGURES_DIR, exist_ok=True)
+        _plt = plt
+    return _plt
 
 #==============================================================================
 # FIGURA 1: Distribución de Frecuencia de Palabras (Simulación)
@@ -56,6 +65,7 @@ def generate_word_frequency_plot():
     Genera un gráfico de barras con las 25 palabras más frecuentes.
     NOTA: Los datos son representativos - reemplazar con datos reales del notebook.
     """
+    plt = _pyplot()
     # Datos representativos basados en el análisis de AI en investigación clínica
     words = [
         'patients', 'clinical', 'data', 'model', 'learning',
@@ -105,6 +115,7 @@ def generate_elbow_plot():
     """
     Genera el gráfico del método del codo para determinar K óptimo.
     """
+    plt = _pyplot()
     # Datos representativos del análisis K-Means
     k_values = range(2, 16)
     
@@ -144,6 +155,7 @@ def generate_tsne_plot():
     """
     Genera visualización t-SNE de los clusters temáticos.
     """
+    plt = _pyplot()
     np.random.seed(42)
     
     # Simular 5 clusters en espacio 2D
@@ -195,6 +207,7 @@ def generate_cluster_evolution_plot():
     """
     Genera gráfico de líneas de la evolución de clusters por año.
     """
+    plt = _pyplot()
     years = ['2019', '2020', '2021', '2022', '2023', '2024', '2025*']
     
     # Datos representativos de publicaciones por cluster por año
@@ -236,6 +249,7 @@ def generate_topic_distribution_plot():
     """
     Genera un gráfico de pastel con la distribución de temas.
     """
+    plt = _pyplot()
     labels = [
         'Deep Learning\nDiagnostics (25%)',
         'NLP Clinical\nNotes (21%)',
@@ -266,17 +280,40 @@ def generate_topic_distribution_plot():
 #==============================================================================
 # MAIN EXECUTION
 #==============================================================================
-if __name__ == "__main__":
+FIGURES = {
+    'fig1': generate_word_frequency_plot,
+    'fig2': generate_elbow_plot,
+    'fig3': generate_tsne_plot,
+    'fig4': generate_cluster_evolution_plot,
+    'fig5': generate_topic_distribution_plot,
+}
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Figuras de publicación')
+    parser.add_argument('figures', nargs='*', metavar='figure',
+                        help=f"Figuras a generar (por defecto todas): {', '.join(FIGURES)}")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.figures if name not in FIGURES]
+    if unknown:
+        parser.error(f"figura desconocida: {', '.join(unknown)} "
+                     f"(opciones: {', '.join(FIGURES)})")
+    args.figures = args.figures or list(FIGURES)
+    return args
+
+
+def main(argv=None):
+    selected = parse_args(argv).figures
+
     print("\n" + "="*60)
     print("GENERACIÓN DE FIGURAS PARA PUBLICACIÓN PhD")
     print("="*60 + "\n")
+    print(f"📁 Figuras se guardarán en: {FIGURES_DIR}")
     
     try:
-        generate_word_frequency_plot()
-        generate_elbow_plot()
-        generate_tsne_plot()
-        generate_cluster_evolution_plot()
-        generate_topic_distribution_plot()
+        for name in selected:
+            FIGURES[name]()
         
         print("\n" + "="*60)
         print("✅ TODAS LAS FIGURAS GENERADAS EXITOSAMENTE")
@@ -293,3 +330,7 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n❌ Error generando figuras: {e}")
         raise
+
+
+if __name__ == "__main__":
+    main()
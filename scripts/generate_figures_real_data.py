@@ -12,15 +12,11 @@ Autor: Gilberto Objío Subero
 Fecha: Febrero 2026
 """
 
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')
 import numpy as np
 import os
 
 # Configuración de estilo para publicación científica
-plt.style.use('seaborn-v0_8-whitegrid')
-plt.rcParams.update({
+STYLE_RC = {
     'figure.figsize': (12, 8),
     'figure.dpi': 300,
     'savefig.dpi': 300,
@@ -32,17 +28,27 @@ plt.rcParams.update({
     'ytick.labelsize': 10,
     'legend.fontsize': 9,
     'figure.titlesize': 16
-})
+}
 
 # Directorio de salida
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 FIGURES_DIR = os.path.join(OUTPUT_DIR, 'figures_publication_real')
-os.makedirs(FIGURES_DIR, exist_ok=True)
 
-print("="*70)
-print("FIGURAS DE PUBLICACIÓN - TESIS DOCTORAL")
-print("Datos verificados del manuscrito revisado por José Xavier Barber")
-print("="*70 + "\n")
+_plt = None
+
+
+def _pyplot():
+    """Importa matplotlib (Agg) y aplica el estilo solo al renderizar la primera figura."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        plt.style.use('seaborn-v0_8-whitegrid')
+        plt.rcParams.update(STYLE_RC)
+        os.makedirs(FIGURES_DIR, exist_ok=True)
+        _plt = plt
+    return _plt
 
 # =============================================================================
 # DATOS REALES - TABLA 1 DEL MANUSCRITO (VERIFICADOS)
@@ -76,13 +82,19 @@ CLUSTER_DATA = {
 }
 
 TOTAL_N = sum(CLUSTER_DATA['n'])
-print(f"✓ Total documentos: {TOTAL_N:,} (verificado: 8,395)")
+
+
+def summary_cube():
+    """Cubo clúster × año (2023-2025) reconstruido desde la Tabla 1."""
+    from trends import CountCube
+    return CountCube.from_summary(CLUSTER_DATA)
 
 # =============================================================================
 # FIGURA 1: DISTRIBUCIÓN DE CLUSTERS (BARRAS HORIZONTALES)
 # =============================================================================
 def fig1_cluster_distribution():
     """Gráfico de barras horizontales con N por cluster."""
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(12, 9))
     
     names = CLUSTER_DATA['names'][::-1]  # Invertir para mayor arriba
@@ -117,23 +129,26 @@ def fig1_cluster_distribution():
 # =============================================================================
 # FIGURA 2: EVOLUCIÓN TEMPORAL 2023 vs 2025
 # =============================================================================
-def fig2_temporal_evolution():
-    """Gráfico de barras agrupadas comparando 2023 vs 2025."""
+def fig2_temporal_evolution(cube=None, start=2023, end=2025):
+    """Gráfico de barras agrupadas comparando dos periodos del cubo (2023 vs 2025)."""
+    plt = _pyplot()
+    if cube is None:
+        cube = summary_cube()
     fig, ax = plt.subplots(figsize=(14, 8))
     
-    names = CLUSTER_DATA['names']
-    y2023 = CLUSTER_DATA['y2023']
-    y2025 = CLUSTER_DATA['y2025']
+    names = cube.names
+    y_start = cube.at(start)
+    y_end = cube.at(end)
     
     x = np.arange(len(names))
     width = 0.38
     
-    bars1 = ax.bar(x - width/2, y2023, width, label='2023', color='#3182bd', edgecolor='white')
-    bars2 = ax.bar(x + width/2, y2025, width, label='2025', color='#31a354', edgecolor='white')
+    bars1 = ax.bar(x - width/2, y_start, width, label=str(start), color='#3182bd', edgecolor='white')
+    bars2 = ax.bar(x + width/2, y_end, width, label=str(end), color='#31a354', edgecolor='white')
     
     ax.set_xlabel('Clúster temático')
     ax.set_ylabel('Número de publicaciones')
-    ax.set_title('Figura 2. Evolución temporal de publicaciones por clúster (2023 vs 2025)', 
+    ax.set_title(f'Figura 2. Evolución temporal de publicaciones por clúster ({start} vs {end})', 
                  fontweight='bold', pad=15)
     ax.set_xticks(x)
     ax.set_xticklabels(names, rotation=45, ha='right', fontsize=9)
@@ -151,14 +166,20 @@ def fig2_temporal_evolution():
 # =============================================================================
 # FIGURA 3: CRECIMIENTO PORCENTUAL POR CLUSTER
 # =============================================================================
-def fig3_growth_rate():
-    """Gráfico de barras con % de crecimiento."""
+def fig3_growth_rate(cube=None, start=2023, end=2025):
+    """Gráfico de barras con % de crecimiento (recalculado desde el cubo)."""
+    plt = _pyplot()
+    if cube is None:
+        cube = summary_cube()
     fig, ax = plt.subplots(figsize=(14, 7))
     
-    # Ordenar por crecimiento
-    sorted_indices = np.argsort(CLUSTER_DATA['growth'])[::-1]
-    names = [CLUSTER_DATA['names'][i] for i in sorted_indices]
-    growth = [CLUSTER_DATA['growth'][i] for i in sorted_indices]
+    # Ordenar por crecimiento; sin documentos en `start` el crecimiento no
+    # está definido, así que esos clústeres se excluyen y se indica en la figura
+    ranking = cube.emerging(start, end, min_count=0)
+    excluded = ranking.loc[ranking['start'] == 0, 'name'].tolist()
+    ranking = ranking[ranking['start'] > 0]
+    names = ranking['name'].tolist()
+    growth = ranking['growth'].round().astype(int).tolist()
     
     # Colores: destacar los de mayor crecimiento
     colors = ['#e31a1c' if g >= 200 else '#fd8d3c' if g >= 100 else '#3182bd' for g in growth]
@@ -168,13 +189,16 @@ def fig3_growth_rate():
     ax.set_xticks(range(len(names)))
     ax.set_xticklabels(names, rotation=45, ha='right', fontsize=9)
     ax.set_ylabel('Crecimiento (%)')
-    ax.set_title('Figura 3. Tasa de crecimiento por clúster temático (2023-2025)\nOrdenado de mayor a menor crecimiento', 
+    ax.set_title(f'Figura 3. Tasa de crecimiento por clúster temático ({start}-{end})\nOrdenado de mayor a menor crecimiento', 
                  fontweight='bold', pad=15)
     
-    # Etiquetas de %
+    # Etiquetas de % (debajo de la barra si el crecimiento es negativo)
+    low, high = min([0] + growth), max([0] + growth)
+    pad = max(high - low, 1) * 0.02
     for bar, g in zip(bars, growth):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5, 
-                f'+{g}%', ha='center', va='bottom', fontsize=9, fontweight='bold')
+        ax.text(bar.get_x() + bar.get_width()/2, g + pad if g >= 0 else g - pad,
+                f'{g:+d}%', ha='center', va='bottom' if g >= 0 else 'top',
+                fontsize=9, fontweight='bold')
     
     # Leyenda de colores
     from matplotlib.patches import Patch
@@ -185,7 +209,14 @@ def fig3_growth_rate():
     ]
     ax.legend(handles=legend_elements, loc='upper right')
     
-    ax.set_ylim(0, max(growth) * 1.15)
+    margin = max(high - low, 1) * 0.15
+    ax.set_ylim(low - margin if low < 0 else 0, high + margin)
+    if low < 0:
+        ax.axhline(0, color='black', linewidth=0.8)
+    if excluded:
+        note = f"Excluidos (0 documentos en {start}): {', '.join(excluded)}"
+        fig.text(0.01, 0.01, note, fontsize=8, style='italic', ha='left', va='bottom')
+        print(f"  ⚠️  {note}")
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     
@@ -198,30 +229,29 @@ def fig3_growth_rate():
 # =============================================================================
 # FIGURA 4: TOP 3 CLUSTERS DE MAYOR CRECIMIENTO (DESTACADO)
 # =============================================================================
-def fig4_top_growth():
-    """Gráfico destacando los 3 clusters de mayor crecimiento."""
+def fig4_top_growth(cube=None, start=2023, end=2025, k=3):
+    """Gráfico destacando los k clusters de mayor crecimiento (temas emergentes)."""
+    plt = _pyplot()
+    if cube is None:
+        cube = summary_cube()
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    # Top 3 por crecimiento
-    top_clusters = [
-        ('NLP & LLMs', 70, 238, 240),
-        ('CT Radiomics', 56, 184, 229),
-        ('Clinical Studies (Retrospective)', 105, 341, 225)
-    ]
+    # Top k por crecimiento
+    top_clusters = cube.emerging(start, end, k=k)
     
-    names = [t[0] for t in top_clusters]
-    y2023 = [t[1] for t in top_clusters]
-    y2025 = [t[2] for t in top_clusters]
-    growth = [t[3] for t in top_clusters]
+    names = top_clusters['name'].tolist()
+    y_start = top_clusters['start'].tolist()
+    y_end = top_clusters['end'].tolist()
+    growth = top_clusters['growth'].round().astype(int).tolist()
     
     x = np.arange(len(names))
     width = 0.35
     
-    bars1 = ax.bar(x - width/2, y2023, width, label='2023', color='#9ecae1')
-    bars2 = ax.bar(x + width/2, y2025, width, label='2025', color='#de2d26')
+    bars1 = ax.bar(x - width/2, y_start, width, label=str(start), color='#9ecae1')
+    bars2 = ax.bar(x + width/2, y_end, width, label=str(end), color='#de2d26')
     
     ax.set_ylabel('Número de publicaciones')
-    ax.set_title('Figura 4. Clústeres de mayor crecimiento (2023-2025)\nTop 3 áreas emergentes en IA clínica', 
+    ax.set_title(f'Figura 4. Clústeres de mayor crecimiento ({start}-{end})\nTop {k} áreas emergentes en IA clínica', 
                  fontweight='bold', pad=15)
     ax.set_xticks(x)
     ax.set_xticklabels(names, fontsize=10)
@@ -229,7 +259,7 @@ def fig4_top_growth():
     
     # Anotar crecimiento
     for i, (bar2, g) in enumerate(zip(bars2, growth)):
-        ax.annotate(f'+{g}%', 
+        ax.annotate(f'{g:+d}%', 
                    xy=(bar2.get_x() + bar2.get_width()/2, bar2.get_height()),
                    xytext=(0, 10), textcoords='offset points',
                    ha='center', fontsize=12, fontweight='bold', color='#de2d26')
@@ -248,6 +278,7 @@ def fig4_top_growth():
 # =============================================================================
 def table_summary():
     """Genera tabla resumen como imagen."""
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(14, 10))
     ax.axis('off')
     
@@ -294,13 +325,61 @@ def table_summary():
 # =============================================================================
 # EJECUCIÓN PRINCIPAL
 # =============================================================================
-if __name__ == "__main__":
+FIGURES = {
+    'fig1': fig1_cluster_distribution,
+    'fig2': fig2_temporal_evolution,
+    'fig3': fig3_growth_rate,
+    'fig4': fig4_top_growth,
+    'tabla1': table_summary,
+}
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Figuras de publicación (datos reales)')
+    parser.add_argument('figures', nargs='*', metavar='figure',
+                        help=f"Figuras a generar (por defecto todas): {', '.join(FIGURES)}")
+    parser.add_argument('--assignments',
+                        help='Asignaciones para fig2-fig4: CSV(.gz), Parquet o directorio '
+                             'exportado por export_results')
+    parser.add_argument('--cluster-col', default='Cluster')
+    parser.add_argument('--year-col', default='Year')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.figures if name not in FIGURES]
+    if unknown:
+        parser.error(f"figura desconocida: {', '.join(unknown)} "
+                     f"(opciones: {', '.join(FIGURES)})")
+    args.figures = args.figures or list(FIGURES)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    cube = None
+    if args.assignments:
+        from trends import CountCube
+        from validate_assignments import load_assignments
+        assignments = load_assignments(args.assignments, [args.cluster_col, args.year_col],
+                                       cluster_col=args.cluster_col, year_col=args.year_col)
+        cube = CountCube.from_assignments(assignments[args.cluster_col],
+                                          assignments[args.year_col],
+                                          n_clusters=len(CLUSTER_DATA['names']),
+                                          names=CLUSTER_DATA['names'])
+    selected = args.figures
+
+    print("="*70)
+    print("FIGURAS DE PUBLICACIÓN - TESIS DOCTORAL")
+    print("Datos verificados del manuscrito revisado por José Xavier Barber")
+    print("="*70 + "\n")
+    print(f"✓ Total documentos: {TOTAL_N:,} (verificado: 8,395)")
+
     try:
-        fig1_cluster_distribution()
-        fig2_temporal_evolution()
-        fig3_growth_rate()
-        fig4_top_growth()
-        table_summary()
+        for name in selected:
+            if cube is not None and name in ('fig2', 'fig3', 'fig4'):
+                FIGURES[name](cube)
+            else:
+                FIGURES[name]()
         
         print("\n" + "="*70)
         print("✅ TODAS LAS FIGURAS GENERADAS EXITOSAMENTE")
@@ -316,3 +395,7 @@ if __name__ == "__main__":
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+ÍNDICE INVERTIDO Y BÚSQUEDA BM25 - TESIS DOCTORAL
+==================================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Construye un índice invertido compacto (término → lista ordenada de doc ids)
+a partir de los tokens producidos por `normalizeCorpus`, con facetas de
+clúster y año, para responder consultas del tipo "documentos del clúster 7
+que mencionan federated learning" sin recorrer `df_final` con `str.contains`.
+Las consultas en texto libre pasan por el mismo pipeline que el corpus
+(`normalize_query`: clean_document + normalize_document).
+
+Los doc ids son posicionales: el documento i corresponde a la fila i de
+`df_final` (mismo orden que `corpus`).
+
+Formato en disco (un directorio con arrays .npy, cargados con mmap):
+    vocab.npy     términos ordenados (unicode de ancho fijo)
+    offsets.npy   inicio de las postings de cada término (n_terms + 1)
+    postings.npy  doc ids, ordenados dentro de cada término
+    tf.npy        frecuencia del término en cada posting
+    doc_len.npy   longitud (en tokens) de cada documento
+    cluster.npy   clúster de cada documento (-1 si no se conoce)
+    year.npy      año de cada documento (-1 si no se conoce)
+
+Uso:
+    python scripts/search_index.py build corpus_normalizado.csv indice/
+    python scripts/search_index.py query indice/ "federated learning" --cluster 7
+    python scripts/search_index.py query indice/ "feder learn" --stems
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+# Parámetros estándar de Okapi BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+INDEX_ARRAYS = ['vocab', 'offsets', 'postings', 'tf', 'doc_len', 'cluster', 'year']
+
+
+def _as_tokens(document):
+    """Acepta un documento normalizado como cadena ("token token ...") o lista."""
+    if isinstance(document, str):
+        return document.split()
+    return list(document)
+
+
+def normalize_query(text):
+    """
+    Limpia y aplica stemming a una consulta en texto libre con el mismo
+    pipeline que el corpus ("federated learning" → "feder learn").
+    """
+    from text_processing import clean_document, normalize_document
+    return normalize_document(clean_document(text))
+
+
+def _as_selector(values):
+    """Normaliza un filtro de faceta (escalar o iterable) a un array de enteros."""
+    if values is None:
+        return None
+    return np.atleast_1d(np.asarray(values, dtype=np.int64))
+
+
+def _facet_codes(values, n_docs):
+    """Faceta como int16; los valores ausentes (None / NaN) pasan a -1."""
+    codes = np.full(n_docs, -1, dtype=np.int16)
+    if values is not None:
+        values = np.asarray(values, dtype=np.float64)
+        known = ~np.isnan(values)
+        codes[known] = values[known].astype(np.int16)
+    return codes
+
+
+class InvertedIndex:
+    """
+    Índice invertido en formato CSR (offsets + postings) con facetas.
+
+    Construir con `InvertedIndex.build(corpus, clusters, years)` o cargar
+    desde disco con `InvertedIndex.load(path)`.
+    """
+
+    def __init__(self, vocab, offsets, postings, tf, doc_len, cluster, year):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.postings = postings
+        self.tf = tf
+        self.doc_len = doc_len
+        self.cluster = cluster
+        self.year = year
+        self.n_docs = len(doc_len)
+        self.avg_doc_len = float(doc_len.mean()) if self.n_docs else 0.0
+
+    # -------------------------------------------------------------------------
+    # Construcción
+    # -------------------------------------------------------------------------
+    @classmethod
+    def build(cls, corpus, clusters=None, years=None):
+        """
+        Construye el índice a partir del corpus normalizado.
+
+        corpus:   lista de documentos (salida de normalizeCorpus o listas de tokens)
+        clusters: etiquetas de clúster por documento (p. ej. kmeans.labels_)
+        years:    año de publicación por documento (p. ej. df_final['Year'])
+        """
+        term_ids = {}
+        doc_term = []
+        doc_len = []
+        for document in corpus:
+            tokens = _as_tokens(document)
+            doc_len.append(len(tokens))
+            doc_term.append([term_ids.setdefault(t, len(term_ids)) for t in tokens])
+
+        n_docs = len(doc_len)
+        doc_len = np.asarray(doc_len, dtype=np.int32)
+        term_col = np.fromiter((t for ids in doc_term for t in ids),
+                               dtype=np.int64, count=int(doc_len.sum()))
+        doc_col = np.repeat(np.arange(n_docs, dtype=np.int64), doc_len)
+
+        # Reordenar los ids de término según el orden alfabético del vocabulario
+        # para poder buscar términos con searchsorted sobre el array cargado con mmap.
+        terms = np.array(list(term_ids), dtype=str) if term_ids else np.array([], dtype='<U1')
+        order = np.argsort(terms, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        vocab = terms[order]
+        term_col = rank[term_col] if len(term_col) else term_col
+
+        # Pares (término, doc) únicos, ordenados por término y luego por doc
+        key = term_col * max(n_docs, 1) + doc_col
+        key, tf = np.unique(key, return_counts=True)
+        post_term = key // max(n_docs, 1)
+        postings = (key % max(n_docs, 1)).astype(np.int32)
+
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(post_term, minlength=len(vocab)), out=offsets[1:])
+
+        cluster = _facet_codes(clusters, n_docs)
+        year = _facet_codes(years, n_docs)
+
+        return cls(vocab, offsets, postings, tf.astype(np.int32), doc_len, cluster, year)
+
+    # -------------------------------------------------------------------------
+    # Persistencia
+    # -------------------------------------------------------------------------
+    def save(self, path):
+        """Guarda el índice como un directorio de arrays .npy."""
+        os.makedirs(path, exist_ok=True)
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(path, name + '.npy'), getattr(self, name))
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'n_docs': self.n_docs, 'n_terms': len(self.vocab),
+                       'n_postings': len(self.postings)}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Carga un índice guardado con `save`; por defecto con memory-mapping."""
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mode)
+                  for name in INDEX_ARRAYS}
+        return cls(**arrays)
+
+    # -------------------------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------------------------
+    def term_id(self, term):
+        """Devuelve el id del término o -1 si no está en el vocabulario."""
+        i = int(np.searchsorted(self.vocab, term))
+        if i < len(self.vocab) and self.vocab[i] == term:
+            return i
+        return -1
+
+    def _postings(self, term):
+        t = self.term_id(term)
+        if t < 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        start, end = self.offsets[t], self.offsets[t + 1]
+        return self.postings[start:end], self.tf[start:end]
+
+    def _facet_mask(self, doc_ids, cluster=None, year=None):
+        """Máscara booleana sobre doc_ids que cumplen los filtros de faceta."""
+        mask = np.ones(len(doc_ids), dtype=bool)
+        cluster = _as_selector(cluster)
+        if cluster is not None:
+            mask &= np.isin(self.cluster[doc_ids], cluster)
+        year = _as_selector(year)
+        if year is not None:
+            mask &= np.isin(self.year[doc_ids], year)
+        return mask
+
+    def docs_with(self, terms, cluster=None, year=None):
+        """
+        Doc ids (ordenados) que contienen TODOS los términos, filtrados por
+        clúster y/o año. Los términos deben estar ya normalizados (stems).
+        """
+        terms = _as_tokens(terms)
+        if not terms:
+            return np.empty(0, dtype=np.int32)
+        lists = sorted((self._postings(t)[0] for t in terms), key=len)
+        result = np.asarray(lists[0])
+        for ids in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result[self._facet_mask(result, cluster, year)]
+
+    def idf(self, term):
+        """IDF de BM25 (variante no negativa de Lucene)."""
+        t = self.term_id(term)
+        df = self.offsets[t + 1] - self.offsets[t] if t >= 0 else 0
+        return float(np.log1p((self.n_docs - df + 0.5) / (df + 0.5)))
+
+    def search(self, query, k=10, cluster=None, year=None, k1=BM25_K1, b=BM25_B):
+        """
+        Ranking BM25 de la consulta (términos normalizados).
+
+        Devuelve (doc_ids, scores) con los k mejores documentos, en orden
+        descendente de score, restringidos a las facetas indicadas.
+        """
+        scores = np.zeros(self.n_docs, dtype=np.float64)
+        avg_len = max(self.avg_doc_len, 1e-9)
+        for term in _as_tokens(query):
+            ids, tf = self._postings(term)
+            if not len(ids):
+                continue
+            tf = np.asarray(tf, dtype=np.float64)
+            norm = k1 * (1.0 - b + b * self.doc_len[ids] / avg_len)
+            scores[ids] += self.idf(term) * tf * (k1 + 1.0) / (tf + norm)
+
+        candidates = np.flatnonzero(scores)
+        candidates = candidates[self._facet_mask(candidates, cluster, year)]
+        if len(candidates) > k:
+            top = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        order = np.lexsort((candidates, -scores[candidates]))
+        candidates = candidates[order]
+        return candidates, scores[candidates]
+
+    def facet_counts(self, doc_ids):
+        """Conteos por clúster y por año de un conjunto de resultados."""
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        clusters, c_counts = np.unique(self.cluster[doc_ids], return_counts=True)
+        years, y_counts = np.unique(self.year[doc_ids], return_counts=True)
+        return {'cluster': dict(zip(clusters.tolist(), c_counts.tolist())),
+                'year': dict(zip(years.tolist(), y_counts.tolist()))}
+
+
+# =============================================================================
+# EJECUCIÓN PRINCIPAL
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Índice invertido BM25 del corpus')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_build = sub.add_parser('build', help='Construir el índice desde un CSV')
+    p_build.add_argument('csv')
+    p_build.add_argument('output')
+    p_build.add_argument('--text-col', default='corpus')
+    p_build.add_argument('--cluster-col', default='Cluster')
+    p_build.add_argument('--year-col', default='Year')
+
+    p_query = sub.add_parser('query', help='Consultar un índice guardado')
+    p_query.add_argument('index')
+    p_query.add_argument('terms')
+    p_query.add_argument('-k', type=int, default=10)
+    p_query.add_argument('--cluster', type=int, nargs='*')
+    p_query.add_argument('--year', type=int, nargs='*')
+    p_query.add_argument('--stems', action='store_true',
+                         help='La consulta ya son stems (sin limpiar ni normalizar)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        import pandas as pd
+        df = pd.read_csv(args.csv)
+        index = InvertedIndex.build(
+            df[args.text_col].fillna('').tolist(),
+            clusters=df[args.cluster_col] if args.cluster_col in df else None,
+            years=df[args.year_col] if args.year_col in df else None)
+        index.save(args.output)
+        print(f"✓ Índice guardado: {args.output} "
+              f"({index.n_docs:,} documentos, {len(index.vocab):,} términos)")
+    else:
+        index = InvertedIndex.load(args.index)
+        query = args.terms if args.stems else normalize_query(args.terms)
+        doc_ids, scores = index.search(query, k=args.k,
+                                       cluster=args.cluster, year=args.year)
+        for doc_id, score in zip(doc_ids, scores):
+            print(f"{doc_id}\t{score:.4f}\tcluster={index.cluster[doc_id]}\tyear={index.year[doc_id]}")
+
+
+if __name__ == "__main__":
+    main()
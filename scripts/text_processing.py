@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+PREPROCESAMIENTO DEL CORPUS - TESIS DOCTORAL
+=============================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Versión en módulo de `processCorpus`, `normalizeCorpus` y `twoLetters` del
+notebook AIReviewer_Scientific_Text_Analysis, sin descargas en tiempo de
+ejecución:
+
+- Las stopwords están precompiladas como un frozenset en
+  `nlp_resources.py`; no se ejecuta `nltk.download(...)` ni `wget` en cada
+  corrida. El artefacto actual contiene solo NLTK english: la lista
+  personalizada `stop_words_1.txt` del notebook aún no está incorporada
+  (`CUSTOM_SOURCES` vacío), así que `process_corpus` avisa de que el
+  vocabulario no coincide con el de `processCorpus` hasta regenerarlo.
+- La tokenización aplica solo las reglas de `word_tokenize`
+  (NLTKWordTokenizer) que siguen actuando sobre texto ya limpio, sin
+  puntuación ASCII ni dígitos: comillas tipográficas y guiones Unicode
+  separados, y contracciones sin apóstrofo ("cannot" → "can" + "not").
+  No se necesitan los datos `punkt` / `punkt_tab`.
+- Las dependencias pesadas (nltk para el stemmer, unidecode) se importan
+  solo cuando se usa la etapa que las necesita.
+- `normalize_corpus` puede registrar, para cada stem, las formas
+  superficiales que lo originaron (`surface_forms`), para que las etiquetas
+  de clúster muestren "learning" en lugar de "learn".
+
+Para regenerar `nlp_resources.py` (requiere red una sola vez):
+    python scripts/text_processing.py build-resources --custom stop_words_1.txt
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import os
+import re
+import string
+import warnings
+from collections import Counter, defaultdict
+
+from nlp_resources import CUSTOM_SOURCES, STOPWORDS
+
+RESOURCES_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nlp_resources.py')
+# Lista personalizada que descarga el notebook (wget) en processCorpus
+NOTEBOOK_CUSTOM_LIST = 'stop_words_1.txt'
+
+# Longitudes de token aceptadas (twoLetters elimina <3 y >21 caracteres)
+MIN_TOKEN_LEN = 3
+MAX_TOKEN_LEN = 21
+
+# Expresiones regulares precompiladas (mismo orden que processCorpus)
+_RE_EMAIL = re.compile(r"\S*@\S*\s?")
+_RE_HTTP = re.compile(r'http\S+')
+_RE_WWW = re.compile(r'www\S+')
+_RE_DIGIT_WORD = re.compile(r"\S*\d\S*")
+_RE_SPECIAL = re.compile(r'\W_')
+_RE_SPACES = re.compile(' +')
+# Reglas de NLTKWordTokenizer (word_tokenize) que aún actúan sobre texto
+# limpio: comillas tipográficas / guiones Unicode como token propio y las
+# contracciones de MacIntyre sin apóstrofo ("cannot" → "can" + "not")
+_RE_SPLIT_CHARS = re.compile('([«“‘„»”’\u2012-\u2015])')
+_RE_CONTRACTIONS = [re.compile(p) for p in (
+    r"(?i)\b(can)(not)\b",
+    r"(?i)\b(gim)(me)\b",
+    r"(?i)\b(gon)(na)\b",
+    r"(?i)\b(got)(ta)\b",
+    r"(?i)\b(lem)(me)\b",
+    r"(?i)\b(wan)(na)(?=\s)",
+)]
+
+_PUNCT_TABLE = str.maketrans({c: ' ' for c in string.punctuation})
+_CHAR_TABLE = str.maketrans({'\ufffd': None, '\xa0': None})
+
+_stemmer = None
+_stem_cache = {}
+_unidecode = None
+
+
+def tokenize(text):
+    """
+    Equivalente a nltk.word_tokenize sobre texto limpio (sin puntuación
+    ASCII ni dígitos): el resto de caracteres ('…', '·', ...) queda unido a
+    la palabra, igual que en NLTK.
+    """
+    text = _RE_SPLIT_CHARS.sub(r' \1 ', f' {text} ')
+    for regexp in _RE_CONTRACTIONS:
+        text = regexp.sub(r' \1 \2 ', text)
+    return text.split()
+
+
+def two_letters(list_of_tokens):
+    """Tokens con menos de 3 o más de 21 caracteres (twoLetters del notebook)."""
+    return [t for t in list_of_tokens
+            if len(t) < MIN_TOKEN_LEN or len(t) > MAX_TOKEN_LEN]
+
+
+def _valid_length(token):
+    return MIN_TOKEN_LEN <= len(token) <= MAX_TOKEN_LEN
+
+
+def _to_ascii(text):
+    global _unidecode
+    if _unidecode is None:
+        from unidecode import unidecode as _unidecode
+    return _unidecode(text)
+
+
+def clean_document(text, stopwords=STOPWORDS):
+    """Limpia un documento (título + abstract) igual que processCorpus."""
+    text = _RE_EMAIL.sub(" ", text)
+    text = _RE_HTTP.sub('', text)
+    text = _RE_WWW.sub('', text)
+    text = text.translate(_CHAR_TABLE)
+    text = _RE_DIGIT_WORD.sub(" ", text)
+    text = _RE_SPECIAL.sub(' ', text)
+    text = text.casefold()
+    text = text.translate(_PUNCT_TABLE)
+    text = _RE_SPACES.sub(' ', text)
+    text = ''.join(c for c in text if not c.isdigit())
+    tokens = [t for t in tokenize(text) if t not in stopwords and _valid_length(t)]
+    return _to_ascii(" ".join(tokens))
+
+
+def process_corpus(corpus, stopwords=STOPWORDS):
+    """
+    Limpieza del corpus: emails, URLs, números, puntuación, stopwords y
+    tokens de longitud fuera de rango. Modifica la lista y la devuelve.
+
+    Con las stopwords por defecto avisa (UserWarning) si el artefacto no
+    incluye `stop_words_1.txt`: el resultado no es el de processCorpus.
+    """
+    if stopwords is STOPWORDS and NOTEBOOK_CUSTOM_LIST not in CUSTOM_SOURCES:
+        warnings.warn(
+            f"nlp_resources.py solo contiene las stopwords de NLTK; falta "
+            f"{NOTEBOOK_CUSTOM_LIST}, así que el vocabulario difiere del de "
+            f"processCorpus. Regenerar con: python scripts/text_processing.py "
+            f"build-resources --custom {NOTEBOOK_CUSTOM_LIST}", UserWarning, stacklevel=2)
+    for index, document in enumerate(corpus):
+        corpus[index] = clean_document(document, stopwords)
+    return corpus
+
+
+def stem(token):
+    """Snowball (english) con caché: cada forma distinta se stemiza una vez."""
+    global _stemmer
+    try:
+        return _stem_cache[token]
+    except KeyError:
+        pass
+    if _stemmer is None:
+        from nltk.stem.snowball import SnowballStemmer
+        _stemmer = SnowballStemmer('english')
+    result = _stem_cache[token] = _stemmer.stem(token)
+    return result
+
+
+def normalize_document(text, surface_forms=None):
+    """
+    Stemming de un documento limpio (normalizeCorpus para un documento).
+    Si se pasa `surface_forms` (ver `new_surface_forms`), cuenta qué forma
+    superficial produjo cada stem conservado.
+    """
+    stems = []
+    for token in tokenize(text):
+        s = stem(token)
+        if _valid_length(s):
+            stems.append(s)
+            if surface_forms is not None:
+                surface_forms[s][token] += 1
+    return " ".join(stems)
+
+
+def normalize_corpus(corpus, surface_forms=None):
+    """Aplica stemming al corpus limpio. Modifica la lista y la devuelve."""
+    for index, document in enumerate(corpus):
+        corpus[index] = normalize_document(document, surface_forms)
+    return corpus
+
+
+def new_surface_forms():
+    """Caché stem → Counter de formas superficiales, para normalize_corpus."""
+    return defaultdict(Counter)
+
+
+def most_frequent_forms(surface_forms):
+    """Reduce la caché a {stem: forma superficial más frecuente}."""
+    return {s: forms.most_common(1)[0][0] for s, forms in surface_forms.items() if forms}
+
+
+# Alias con los nombres del notebook
+processCorpus = process_corpus
+normalizeCorpus = normalize_corpus
+twoLetters = two_letters
+
+
+# =============================================================================
+# GENERACIÓN DEL ARTEFACTO DE STOPWORDS
+# =============================================================================
+def build_resources(custom_paths=(), output=RESOURCES_MODULE):
+    """
+    Genera `nlp_resources.py` con la unión de las stopwords de NLTK (english)
+    y las listas personalizadas indicadas, como un frozenset literal.
+    """
+    import nltk
+    nltk.download('stopwords', quiet=True)
+    from nltk.corpus import stopwords as nltk_stopwords
+
+    words = set(nltk_stopwords.words('english'))
+    for path in custom_paths:
+        with open(path, encoding='utf-8') as f:
+            words.update(line.rstrip('\n') for line in f if line.strip())
+    sources = tuple(os.path.basename(p) for p in custom_paths)
+
+    lines = [
+        '# -*- coding: utf-8 -*-',
+        '"""',
+        f"Stopwords precompiladas: NLTK english + {', '.join(sources)}." if sources
+        else 'Stopwords precompiladas: solo NLTK english (sin listas personalizadas).',
+        '',
+        'Archivo generado por `text_processing.build_resources`; no editar a mano.',
+        '"""',
+        '',
+        f'CUSTOM_SOURCES = {sources!r}',
+        '',
+        'STOPWORDS = frozenset({',
+    ]
+    lines += [f'    {w!r},' for w in sorted(words)]
+    lines += ['})', '']
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    print(f"✓ {len(words):,} stopwords guardadas en: {output}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Recursos NLP del corpus')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_build = sub.add_parser('build-resources', help='Regenerar nlp_resources.py')
+    p_build.add_argument('--custom', nargs='*', default=[],
+                         help='Listas de stopwords adicionales (una por línea)')
+    args = parser.parse_args()
+    build_resources(args.custom)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+MOTOR DE TENDENCIAS TEMPORALES POR CLÚSTER - TESIS DOCTORAL
+============================================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Construye una sola vez el cubo de conteos clúster × periodo (año o
+trimestre) con `np.bincount` sobre códigos enteros, y calcula a partir de él:
+
+- participación de cada clúster por periodo (la tabla `dfy_pv` del notebook
+  que alimenta `survey` / `survey2`),
+- crecimiento porcentual y CAGR entre dos periodos cualesquiera,
+- crecimiento móvil con cualquier desfase,
+- ranking de temas emergentes para cualquier ventana.
+
+Sustituye al crecimiento 2023 vs 2025 copiado a mano en
+`CLUSTER_DATA['growth']` y alimenta `fig2_temporal_evolution`,
+`fig3_growth_rate` y `fig4_top_growth`.
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import numpy as np
+
+QUARTERS_PER_YEAR = 4
+
+
+def _int_codes(values, what):
+    """Enteros por documento; los valores ausentes (NaN / NA) son un error."""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.flatnonzero(np.isnan(values))
+    if len(missing):
+        raise ValueError(f"{what}: {len(missing):,} valores ausentes "
+                         f"(primera fila {int(missing[0])})")
+    return values.astype(np.int64)
+
+
+class CountCube:
+    """
+    Cubo de conteos (n_clusters x n_periodos).
+
+    Los periodos son consecutivos (sin huecos): un periodo sin documentos
+    aparece con conteo cero, de modo que los desfases son exactos.
+    Con freq='quarter' el periodo se codifica como year * 4 + (trimestre - 1).
+    """
+
+    def __init__(self, counts, periods, freq='year', names=None):
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.periods = np.asarray(periods, dtype=np.int64)
+        self.freq = freq
+        n_clusters = self.counts.shape[0]
+        self.names = list(names) if names is not None else [f'Cluster {c}' for c in range(n_clusters)]
+
+    # -------------------------------------------------------------------------
+    # Construcción
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_assignments(cls, clusters, years, quarters=None, n_clusters=None, names=None):
+        """
+        Cubo a partir de una asignación por documento.
+
+        clusters: clúster de cada documento (enteros >= 0)
+        years:    año de cada documento
+        quarters: trimestre (1-4) de cada documento; si se indica, freq='quarter'
+        """
+        clusters = _int_codes(clusters, 'clúster')
+        period = _int_codes(years, 'año')
+        freq = 'year'
+        if quarters is not None:
+            period = period * QUARTERS_PER_YEAR + (_int_codes(quarters, 'trimestre') - 1)
+            freq = 'quarter'
+        if n_clusters is None:
+            n_clusters = int(clusters.max()) + 1 if len(clusters) else 0
+        if len(clusters) and (clusters.min() < 0 or clusters.max() >= n_clusters):
+            raise ValueError(
+                f"Ids de clúster fuera de [0, {n_clusters}): "
+                f"mínimo {int(clusters.min())}, máximo {int(clusters.max())}")
+        if not len(period):
+            return cls(np.zeros((n_clusters, 0)), [], freq, names)
+        first = int(period.min())
+        n_periods = int(period.max()) - first + 1
+        flat = clusters * n_periods + (period - first)
+        counts = np.bincount(flat, minlength=n_clusters * n_periods).reshape(n_clusters, n_periods)
+        return cls(counts, np.arange(first, first + n_periods), freq, names)
+
+    @classmethod
+    def from_summary(cls, summary, first_year=2023, last_year=2025):
+        """
+        Cubo anual a partir de la tabla publicada (CLUSTER_DATA): usa
+        y<first_year> e y<last_year> y deduce los años intermedios como
+        n - extremos cuando hay un único año intermedio.
+        """
+        start = np.asarray(summary[f'y{first_year}'], dtype=np.int64)
+        end = np.asarray(summary[f'y{last_year}'], dtype=np.int64)
+        years = list(range(first_year, last_year + 1))
+        if len(years) == 3 and 'n' in summary:
+            middle = np.asarray(summary['n'], dtype=np.int64) - start - end
+            counts = np.column_stack([start, middle, end])
+        else:
+            years = [first_year, last_year]
+            counts = np.column_stack([start, end])
+        return cls(counts, years, 'year', summary.get('names'))
+
+    # -------------------------------------------------------------------------
+    # Acceso
+    # -------------------------------------------------------------------------
+    def period_index(self, period):
+        """Posición de un periodo (año, o (año, trimestre) con freq='quarter')."""
+        if isinstance(period, tuple):
+            period = period[0] * QUARTERS_PER_YEAR + (period[1] - 1)
+        pos = int(period) - int(self.periods[0]) if len(self.periods) else -1
+        if not 0 <= pos < len(self.periods):
+            raise KeyError(f"Periodo fuera del cubo: {period}")
+        return pos
+
+    def period_label(self, period):
+        if self.freq == 'quarter':
+            return f'{period // QUARTERS_PER_YEAR}-Q{period % QUARTERS_PER_YEAR + 1}'
+        return str(period)
+
+    def at(self, period):
+        """Conteos por clúster en un periodo."""
+        return self.counts[:, self.period_index(period)]
+
+    def window(self, start, end):
+        """Sub-cubo con los periodos [start, end] (ambos incluidos)."""
+        i, j = self.period_index(start), self.period_index(end)
+        return CountCube(self.counts[:, i:j + 1], self.periods[i:j + 1], self.freq, self.names)
+
+    def to_yearly(self):
+        """Agrega un cubo trimestral a años."""
+        if self.freq == 'year':
+            return self
+        years = self.periods // QUARTERS_PER_YEAR
+        codes = years - years[0]
+        n_years = int(codes[-1]) + 1
+        counts = np.zeros((self.counts.shape[0], n_years), dtype=np.int64)
+        np.add.at(counts, (slice(None), codes), self.counts)
+        return CountCube(counts, np.arange(years[0], years[0] + n_years), 'year', self.names)
+
+    # -------------------------------------------------------------------------
+    # Métricas
+    # -------------------------------------------------------------------------
+    def totals(self):
+        """Documentos por clúster en todo el cubo."""
+        return self.counts.sum(axis=1)
+
+    def shares(self):
+        """Participación (%) de cada clúster dentro de cada periodo."""
+        per_period = self.counts.sum(axis=0, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(per_period > 0, self.counts / per_period * 100, 0.0)
+
+    def growth(self, start, end):
+        """Crecimiento porcentual (end - start) / start * 100 por clúster."""
+        a = self.at(start).astype(np.float64)
+        b = self.at(end).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(a > 0, (b - a) / a * 100, np.nan)
+
+    def cagr(self, start, end):
+        """Tasa de crecimiento anual compuesta (%) entre dos periodos."""
+        n_years = (self.period_index(end) - self.period_index(start))
+        if self.freq == 'quarter':
+            n_years /= QUARTERS_PER_YEAR
+        a = self.at(start).astype(np.float64)
+        b = self.at(end).astype(np.float64)
+        if n_years <= 0:
+            raise ValueError("end debe ser posterior a start")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(a > 0, (np.power(b / a, 1.0 / n_years) - 1) * 100, np.nan)
+
+    def rolling_growth(self, lag=1):
+        """
+        Crecimiento (%) respecto a `lag` periodos antes, para cada periodo;
+        las primeras `lag` columnas son NaN.
+        """
+        if lag < 1:
+            raise ValueError("lag debe ser >= 1")
+        out = np.full(self.counts.shape, np.nan)
+        prev = self.counts[:, :-lag].astype(np.float64)
+        curr = self.counts[:, lag:].astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[:, lag:] = np.where(prev > 0, (curr - prev) / prev * 100, np.nan)
+        return out
+
+    def emerging(self, start, end, k=None, min_count=1, by='growth'):
+        """
+        Ranking de temas emergentes en la ventana [start, end].
+
+        by: 'growth', 'cagr' o 'share_delta' (cambio de participación en puntos)
+        Devuelve un DataFrame ordenado de mayor a menor.
+        """
+        import pandas as pd
+
+        shares = self.shares()
+        i, j = self.period_index(start), self.period_index(end)
+        table = pd.DataFrame({
+            'name': self.names,
+            'start': self.counts[:, i],
+            'end': self.counts[:, j],
+            'growth': self.growth(start, end),
+            'cagr': self.cagr(start, end),
+            'share_start': shares[:, i],
+            'share_end': shares[:, j],
+        })
+        table['share_delta'] = table['share_end'] - table['share_start']
+        table = table[table['start'] >= min_count]
+        table = table.sort_values(by, ascending=False, kind='stable')
+        return table.head(k) if k is not None else table
+
+    def share_table(self):
+        """Periodo × clúster en % (equivalente a `dfy_pv` del notebook)."""
+        import pandas as pd
+
+        table = pd.DataFrame(self.shares().T, columns=self.names,
+                             index=[self.period_label(p) for p in self.periods])
+        table.index.name = 'Year' if self.freq == 'year' else 'Quarter'
+        return table
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+VALIDACIÓN DE TABLAS DE ASIGNACIÓN A CLÚSTERES - TESIS DOCTORAL
+================================================================
+AI in Clinical Research Scoping Review (2023-2025)
+
+Aplica los mismos invariantes de `tests/test_data_integrity.py` directamente
+sobre un archivo de asignaciones real (una fila por documento), con
+operaciones vectorizadas por columna:
+
+1. Los conteos por clúster suman el tamaño del corpus.
+2. Los porcentajes publicados coinciden con N/Total dentro de la tolerancia.
+3. El crecimiento publicado coincide con el recalculado a partir de los
+   conteos por año.
+4. No hay años negativos, ausentes o fuera de rango.
+5. Los doc ids son únicos.
+
+Cada verificación fallida informa las primeras filas infractoras. Pensado
+para ejecutarse como compuerta en cada corrida del pipeline (código de salida
+1 si falla alguna verificación).
+
+Uso:
+    python scripts/validate_assignments.py data/sample_data.csv --expected-total 100
+    python scripts/validate_assignments.py asignaciones.csv --summary-from-figures
+    python scripts/validate_assignments.py exports/csv --expected-total 8395
+
+Autor: Gilberto Objío Subero
+Fecha: Febrero 2026
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# Tolerancias (mismas que tests/test_data_integrity.py)
+PCT_TOLERANCE = 0.5
+GROWTH_TOLERANCE = 5
+MAX_EXAMPLES = 5
+
+
+@dataclass
+class CheckResult:
+    """Resultado de una verificación."""
+    name: str
+    passed: bool
+    message: str = ''
+    examples: pd.DataFrame = field(default=None, repr=False)
+
+
+@dataclass
+class ValidationReport:
+    """Conjunto de verificaciones más los conteos calculados."""
+    checks: list
+    counts: pd.Series = None
+    year_counts: pd.DataFrame = None
+
+    @property
+    def passed(self):
+        return all(c.passed for c in self.checks)
+
+    @property
+    def failures(self):
+        return [c for c in self.checks if not c.passed]
+
+    def print(self):
+        for c in self.checks:
+            mark = '✓' if c.passed else '❌'
+            print(f"{mark} {c.name}: {c.message}")
+            if not c.passed and c.examples is not None and len(c.examples):
+                print(c.examples.to_string(max_colwidth=60))
+
+
+def _examples(df, mask, max_examples):
+    """Primeras filas infractoras (posición original incluida como índice)."""
+    idx = np.flatnonzero(mask)[:max_examples]
+    return df.iloc[idx]
+
+
+# =============================================================================
+# VERIFICACIONES SOBRE EL ARCHIVO DE ASIGNACIONES
+# =============================================================================
+def validate_assignments(df, expected_total=None, summary=None,
+                         doc_col='doc_id', cluster_col='cluster_id', year_col='year',
+                         year_range=None, base_year=2023, target_year=2025,
+                         pct_tol=PCT_TOLERANCE, growth_tol=GROWTH_TOLERANCE,
+                         max_examples=MAX_EXAMPLES):
+    """
+    Valida una tabla de asignaciones (una fila por documento).
+
+    expected_total: tamaño esperado del corpus (p. ej. 8395)
+    summary:        tabla publicada con el formato de CLUSTER_DATA
+                    ('n', 'pct', 'y2023', 'y2025', 'growth'), indexada por
+                    cluster id en el mismo orden
+    year_range:     (año mínimo, año máximo) admitidos
+    """
+    checks = []
+
+    # --- Doc ids únicos ------------------------------------------------------
+    dup = df[doc_col].duplicated(keep=False).to_numpy()
+    missing_id = df[doc_col].isna().to_numpy()
+    bad = dup | missing_id
+    checks.append(CheckResult(
+        'doc ids únicos', not bad.any(),
+        f"{int(dup.sum()):,} duplicados, {int(missing_id.sum()):,} ausentes" if bad.any()
+        else f"{len(df):,} doc ids únicos",
+        _examples(df, bad, max_examples)))
+
+    # --- Años válidos --------------------------------------------------------
+    years = pd.to_numeric(df[year_col], errors='coerce').to_numpy(dtype=np.float64)
+    bad = np.isnan(years) | (years < 0) | (years != np.floor(years))
+    if year_range is not None:
+        bad |= (years < year_range[0]) | (years > year_range[1])
+    checks.append(CheckResult(
+        'años válidos', not bad.any(),
+        f"{int(bad.sum()):,} filas con año ausente, negativo o fuera de rango" if bad.any()
+        else 'sin años ausentes ni negativos',
+        _examples(df, bad, max_examples)))
+
+    # --- Clústeres válidos ---------------------------------------------------
+    clusters = pd.to_numeric(df[cluster_col], errors='coerce').to_numpy(dtype=np.float64)
+    bad_cluster = np.isnan(clusters) | (clusters < 0) | (clusters != np.floor(clusters))
+    if summary is not None:
+        bad_cluster |= clusters >= len(summary['n'])
+    checks.append(CheckResult(
+        'clústeres válidos', not bad_cluster.any(),
+        f"{int(bad_cluster.sum()):,} filas con clúster ausente o inválido" if bad_cluster.any()
+        else 'todas las filas tienen clúster',
+        _examples(df, bad_cluster, max_examples)))
+
+    # --- Conteos por clúster (bincount) --------------------------------------
+    ok = ~bad_cluster
+    codes = clusters[ok].astype(np.int64)
+    n_clusters = max(int(codes.max()) + 1 if len(codes) else 0,
+                     len(summary['n']) if summary is not None else 0)
+    counts = np.bincount(codes, minlength=n_clusters)
+    total = int(counts.sum())
+
+    if expected_total is not None:
+        checks.append(CheckResult(
+            'total de documentos', total == expected_total == len(df),
+            f"suma de conteos = {total:,}, filas = {len(df):,}, esperado = {expected_total:,}"))
+
+    # Conteos por (clúster, año) en una sola pasada
+    ok_year = ok & ~np.isnan(years)
+    year_vals = years[ok_year].astype(np.int64)
+    year_index = np.unique(year_vals)
+    cube = np.zeros((n_clusters, len(year_index)), dtype=np.int64)
+    if len(year_vals):
+        y_codes = np.searchsorted(year_index, year_vals)
+        flat = clusters[ok_year].astype(np.int64) * len(year_index) + y_codes
+        cube = np.bincount(flat, minlength=n_clusters * len(year_index)).reshape(
+            n_clusters, len(year_index))
+    year_counts = pd.DataFrame(cube, columns=year_index)
+    year_counts.index.name = cluster_col
+
+    if summary is not None:
+        checks.extend(_compare_summary(counts, year_counts, summary, base_year,
+                                       target_year, pct_tol, growth_tol, max_examples))
+
+    return ValidationReport(checks, pd.Series(counts, name='n'), year_counts)
+
+
+def _year_column(year_counts, year, n):
+    if year in year_counts.columns:
+        return year_counts[year].to_numpy()
+    return np.zeros(n, dtype=np.int64)
+
+
+def _compare_summary(counts, year_counts, summary, base_year, target_year,
+                     pct_tol, growth_tol, max_examples):
+    """Compara los conteos reales contra la tabla publicada (CLUSTER_DATA)."""
+    checks = []
+    n = len(summary['n'])
+    keys = ('n', 'pct', f'y{base_year}', f'y{target_year}', 'growth')
+    table = pd.DataFrame({k: summary[k] for k in keys if k in summary})
+    if 'names' in summary:
+        table.insert(0, 'name', summary['names'])
+    counts = counts[:n]
+    total = counts.sum()
+
+    bad = counts != table['n'].to_numpy()
+    checks.append(CheckResult(
+        'conteos por clúster = tabla', not bad.any(),
+        f"{int(bad.sum())} clústeres difieren" if bad.any() else f"{n} clústeres coinciden",
+        table[bad].assign(calc=counts[bad]).head(max_examples)))
+
+    if 'pct' in table:
+        calc = counts / max(total, 1) * 100
+        bad = np.abs(calc - table['pct'].to_numpy()) >= pct_tol
+        checks.append(CheckResult(
+            'porcentajes = N/Total', not bad.any(),
+            f"{int(bad.sum())} porcentajes fuera de ±{pct_tol}" if bad.any()
+            else f"suma = {table['pct'].sum():.1f}%",
+            table[bad].assign(calc=calc[bad]).head(max_examples)))
+
+    y0 = _year_column(year_counts, base_year, len(counts))[:n]
+    y1 = _year_column(year_counts, target_year, len(counts))[:n]
+    for key, real in ((f'y{base_year}', y0), (f'y{target_year}', y1)):
+        if key in table:
+            bad = real != table[key].to_numpy()
+            checks.append(CheckResult(
+                f'conteos {key[1:]} = tabla', not bad.any(),
+                f"{int(bad.sum())} clústeres difieren" if bad.any() else 'coinciden',
+                table[bad].assign(calc=real[bad]).head(max_examples)))
+
+    if 'growth' in table:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calc = (y1 - y0) / y0 * 100
+        bad = ~(np.abs(calc - table['growth'].to_numpy()) < growth_tol)
+        checks.append(CheckResult(
+            f'crecimiento {base_year}-{target_year}', not bad.any(),
+            f"{int(bad.sum())} tasas fuera de ±{growth_tol} puntos" if bad.any()
+            else 'recalculado desde conteos por año',
+            table[bad].assign(calc=calc[bad]).head(max_examples)))
+    return checks
+
+
+# =============================================================================
+# LECTURA
+# =============================================================================
+def load_assignments(path, columns=None, cluster_col='cluster_id', year_col='year'):
+    """
+    Lee CSV(.gz), Parquet o un directorio exportado por export_results.
+    En un directorio particionado, las columnas `Cluster` / `Year` se
+    renombran a `cluster_col` / `year_col`.
+    """
+    if os.path.isdir(path):
+        from export_results import PARTITION_COLS, read_partition
+        renames = dict(zip(PARTITION_COLS, (cluster_col, year_col)))
+        back = {v: k for k, v in renames.items()}
+        if columns is not None:
+            columns = [back.get(c, c) for c in columns]
+        return read_partition(path, columns=columns).rename(columns=renames)
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    if path.endswith('.xlsx'):
+        return pd.read_excel(path, usecols=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+# =============================================================================
+# EJECUCIÓN PRINCIPAL
+# =============================================================================
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Validar un archivo de asignaciones')
+    parser.add_argument('path')
+    parser.add_argument('--expected-total', type=int)
+    parser.add_argument('--doc-col', default='doc_id')
+    parser.add_argument('--cluster-col', default='cluster_id')
+    parser.add_argument('--year-col', default='year')
+    parser.add_argument('--year-range', type=int, nargs=2)
+    parser.add_argument('--summary-from-figures', action='store_true',
+                        help='Comparar contra CLUSTER_DATA de generate_figures_real_data')
+    args = parser.parse_args(argv)
+
+    summary = None
+    if args.summary_from_figures:
+        from generate_figures_real_data import CLUSTER_DATA
+        summary = CLUSTER_DATA
+
+    df = load_assignments(args.path, [args.doc_col, args.cluster_col, args.year_col],
+                          cluster_col=args.cluster_col, year_col=args.year_col)
+    report = validate_assignments(
+        df, expected_total=args.expected_total, summary=summary,
+        doc_col=args.doc_col, cluster_col=args.cluster_col, year_col=args.year_col,
+        year_range=args.year_range)
+    report.print()
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the WebGL cluster explorer export
+AI in Clinical Research Scoping Review
+"""
+
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from cluster_explorer import (  # noqa: E402
+    POINT_DTYPE, build_explorer, load_projection, save_projection)
+
+
+@pytest.fixture
+def projection():
+    rng = np.random.default_rng(42)
+    labels = rng.integers(0, 5, 2000)
+    xy = rng.normal(size=(2000, 2)) + labels[:, None] * 3
+    return xy, labels
+
+
+@pytest.fixture
+def hover():
+    return pd.DataFrame({'Title': [f'Article {i}' for i in range(2000)],
+                         'Year': [2023 + i % 3 for i in range(2000)],
+                         'Abstract': ['long abstract text'] * 2000})
+
+
+def _manifest(out):
+    with open(os.path.join(out, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestExplorerOutput:
+    """Tests for the explorer directory layout."""
+
+    def test_html_uses_webgl_without_text(self, projection, hover, tmp_path):
+        out = str(tmp_path)
+        build_explorer(*projection, out, hover=hover[['Title', 'Year']])
+        with open(os.path.join(out, 'index.html'), encoding='utf-8') as f:
+            html = f.read()
+        assert 'scattergl' in html
+        assert 'Article 0' not in html
+        assert 'Article 0' not in json.dumps(_manifest(out))
+
+    def test_noise_labels_and_escaped_title(self, projection, tmp_path):
+        xy, labels = projection
+        labels = labels.copy()
+        labels[:10] = -1
+        out = str(tmp_path)
+        build_explorer(xy, labels, out, title='<b>A & B</b>')
+        clusters = _manifest(out)['clusters']
+        assert clusters[-1]['name'] == 'Ruido'
+        assert clusters[-1]['n'] == 10
+        assert sum(c['n'] for c in clusters) == len(labels)
+        with open(os.path.join(out, 'index.html'), encoding='utf-8') as f:
+            assert '<title>&lt;b&gt;A &amp; B&lt;/b&gt;</title>' in f.read()
+
+    def test_3d_projection_warns(self, projection, tmp_path):
+        xy, labels = projection
+        xyz = np.column_stack([xy, np.zeros(len(xy))])
+        with pytest.warns(UserWarning, match='2D'):
+            save_projection(str(tmp_path / 'p.npz'), xyz, labels)
+        assert load_projection(str(tmp_path / 'p.npz'))[0].shape == (len(xy), 2)
+
+    def test_density_counts_all_points(self, projection, tmp_path):
+        build_explorer(*projection, str(tmp_path), density_size=64)
+        manifest = _manifest(str(tmp_path))
+        assert np.asarray(manifest['density']).sum() == 2000
+        assert sum(c['n'] for c in manifest['clusters']) == 2000
+
+    def test_tiles_roundtrip(self, projection, tmp_path):
+        xy, labels = projection
+        build_explorer(xy, labels, str(tmp_path), tile_grid=8)
+        manifest = _manifest(str(tmp_path))
+        files = glob.glob(os.path.join(str(tmp_path), 'tiles', '*.bin'))
+        records = np.concatenate([np.fromfile(f, dtype=POINT_DTYPE) for f in files])
+        assert len(files) == len(manifest['tiles'])
+        assert sum(manifest['tiles'].values()) == len(records) == 2000
+        order = np.argsort(records['doc_id'])
+        assert records['cluster'][order].tolist() == labels.tolist()
+        np.testing.assert_allclose(records['x'][order], xy[:, 0], rtol=1e-6)
+
+    def test_hover_shards_keyed_by_doc_id(self, projection, hover, tmp_path):
+        build_explorer(*projection, str(tmp_path), hover=hover[['Title', 'Year']],
+                       shard_size=500)
+        with open(os.path.join(str(tmp_path), 'hover', '3.json'), encoding='utf-8') as f:
+            shard = json.load(f)
+        assert shard['columns'] == ['Title', 'Year']
+        assert shard['rows']['1501'] == ['Article 1501', '2024']
+        assert len(shard['rows']) == 500
+
+
+class TestProjectionCache:
+    """Tests for the cached projection."""
+
+    def test_roundtrip(self, projection, tmp_path):
+        path = str(tmp_path / 'projection.npz')
+        save_projection(path, *projection)
+        xy, labels, doc_ids = load_projection(path)
+        assert labels.tolist() == projection[1].tolist()
+        assert doc_ids.tolist() == list(range(2000))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
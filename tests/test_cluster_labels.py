@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for class-based TF-IDF cluster labelling
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import cluster_labels as cl  # noqa: E402
+import text_processing as tp  # noqa: E402
+
+CORPUS = [
+    'feder learn preserv privaci',
+    'feder learn preserv data',
+    'deep learn radiom ct',
+    'deep learn radiom mri',
+    'feder learn preserv',
+] * 3
+LABELS = [0, 0, 1, 1, 0] * 3
+
+
+@pytest.fixture
+def keywords():
+    return cl.cluster_keywords(CORPUS, LABELS)
+
+
+class TestKeywords:
+    """Tests for the sparse c-TF-IDF keyword extraction."""
+
+    def test_distinctive_terms_rank_first(self, keywords):
+        assert keywords[0]['terms'][0][0] in {'feder', 'preserv'}
+        assert keywords[1]['terms'][0][0] in {'deep', 'radiom'}
+        # 'learn' aparece en ambos clústeres: pesa menos que los distintivos
+        weights = dict(keywords[0]['terms'])
+        assert weights['learn'] < weights['feder']
+
+    def test_bigrams_are_adjacent_and_frequent(self, keywords):
+        bigrams = [b for b, _ in keywords[0]['bigrams']]
+        assert bigrams[0] == ('feder', 'learn')
+        assert ('mri', 'feder') not in bigrams  # cruzaría documentos
+        # min_bigram_count=3: 'preserv privaci' (3 veces) entra, con 4 no
+        strict = cl.cluster_keywords(CORPUS, LABELS, min_bigram_count=4)
+        assert ('preserv', 'privaci') not in [b for b, _ in strict[0]['bigrams']]
+
+    def test_class_tfidf_matches_formula(self):
+        counts = np.array([[2.0, 0.0], [1.0, 1.0]])
+        weights = cl.class_tfidf(counts).toarray()
+        idf = np.log1p(2.0 / np.array([3.0, 1.0]))
+        np.testing.assert_allclose(weights, counts / counts.sum(axis=1, keepdims=True) * idf)
+
+    def test_empty_cluster(self):
+        keywords = cl.cluster_keywords(['a b', 'a b'], [0, 0], n_clusters=2)
+        assert keywords[1] == {'terms': [], 'bigrams': []}
+
+
+class TestLabels:
+    """Tests for surface forms and the labels written with the assignments."""
+
+    def test_surface_forms_cache(self):
+        forms = tp.new_surface_forms()
+        tp.normalize_document('learning learning learned', forms)
+        assert forms['learn'] == Counter({'learning': 2, 'learned': 1})
+        assert tp.most_frequent_forms(forms)['learn'] == 'learning'
+
+    def test_candidate_labels_use_surface_forms(self, keywords):
+        forms = {'feder': 'federated', 'learn': 'learning'}
+        table = cl.candidate_labels(keywords, forms)
+        assert table['candidate_label'][0].startswith('federated learning')
+        assert list(table.columns) == ['cluster', 'candidate_label', 'top_terms', 'top_bigrams']
+
+    def test_attach_labels(self, keywords):
+        table = cl.candidate_labels(keywords)
+        out = cl.attach_labels(pd.DataFrame({'Cluster': LABELS}), table)
+        assert out['candidate_label'].nunique() == 2
+        assert out['candidate_label'][2] == table['candidate_label'][1]
+
+    def test_forms_roundtrip(self, tmp_path):
+        path = tmp_path / 'forms.json'
+        cl.save_surface_forms(path, {'learn': 'learning'})
+        assert cl.load_surface_forms(path) == {'learn': 'learning'}
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the streaming / partitioned exports
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from export_results import (  # noqa: E402
+    export_csv_gz, export_parquet, export_xlsx, read_partition, write_xlsx_stream)
+
+NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Title': ['Deep learning & <CT>', 'LLMs\x0b for notes', 'Federated EHR'],
+        'Year': [2023, 2025, 2025],
+        'Abstract': ['a' * 40000, 'b', np.nan],
+        'Cluster': [12, 7, 7],
+    })
+
+
+def _read_sheet(path):
+    with zipfile.ZipFile(path) as zf:
+        root = ET.fromstring(zf.read('xl/worksheets/sheet1.xml'))
+    rows = []
+    for row in root.iter(f"{{{NS['s']}}}row"):
+        cells = []
+        for c in row:
+            t = c.find('.//s:t', NS)
+            v = c.find('s:v', NS)
+            cells.append(t.text if t is not None else (v.text if v is not None else None))
+        rows.append(cells)
+    return rows
+
+
+class TestStreamingXlsx:
+    """Tests for the constant-memory xlsx writer."""
+
+    def test_header_and_rows(self, df, tmp_path):
+        path = str(tmp_path / 'out.xlsx')
+        export_xlsx(df, path, index=False)
+        rows = _read_sheet(path)
+        assert rows[0] == ['Title', 'Year', 'Abstract', 'Cluster']
+        assert rows[1][0] == 'Deep learning & <CT>'
+        assert rows[2][0] == 'LLMs for notes'
+        assert rows[3][2] is None
+        assert len(rows) == 4
+
+    def test_cell_truncated_to_excel_limit(self, df, tmp_path):
+        path = str(tmp_path / 'out.xlsx')
+        export_xlsx(df, path, index=False)
+        assert len(_read_sheet(path)[1][2]) == 32767
+
+    def test_generator_input(self, tmp_path):
+        path = str(tmp_path / 'gen.xlsx')
+        n = write_xlsx_stream(((i, f'doc {i}') for i in range(1000)), path)
+        assert n == 1000
+        assert _read_sheet(path)[-1] == ['999', 'doc 999']
+
+
+class TestPartitionedExports:
+    """Tests for cluster/year partitioned outputs."""
+
+    def test_csv_gz_layout(self, df, tmp_path):
+        export_csv_gz(df, str(tmp_path))
+        assert os.path.exists(tmp_path / 'Cluster=7' / 'Year=2025' / 'part-0.csv.gz')
+        assert os.path.exists(tmp_path / 'Cluster=12' / 'Year=2023' / 'part-0.csv.gz')
+
+    def test_read_single_partition(self, df, tmp_path):
+        export_csv_gz(df, str(tmp_path))
+        part = read_partition(str(tmp_path), cluster=7)
+        assert sorted(part['Title']) == ['Federated EHR', 'LLMs\x0b for notes']
+        assert set(part['Year']) == {2025}
+
+    def test_parquet_roundtrip(self, df, tmp_path):
+        pytest.importorskip('pyarrow')
+        export_parquet(df, str(tmp_path))
+        part = read_partition(str(tmp_path), cluster=[12], year=2023)
+        assert part['Title'].tolist() == ['Deep learning & <CT>']
+
+    def test_reexport_replaces_old_partitions(self, df, tmp_path):
+        (tmp_path / 'notes.txt').write_text('keep')
+        export_csv_gz(df, str(tmp_path))
+        export_csv_gz(df[df['Cluster'] == 7], str(tmp_path))
+        assert len(read_partition(str(tmp_path))) == 2
+        assert not os.path.exists(tmp_path / 'Cluster=12')
+        assert (tmp_path / 'notes.txt').exists()
+
+    @pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+    def test_only_partition_columns(self, df, tmp_path, fmt):
+        if fmt == 'parquet':
+            pytest.importorskip('pyarrow')
+            export_parquet(df, str(tmp_path))
+        else:
+            export_csv_gz(df, str(tmp_path))
+        part = read_partition(str(tmp_path), columns=['Cluster', 'Year'])
+        assert list(part.columns) == ['Cluster', 'Year']
+        assert sorted(part['Cluster']) == [7, 7, 12]
+
+    def test_null_and_float_keys(self, tmp_path):
+        df = pd.DataFrame({'Title': list('abcd'), 'Cluster': [1, np.nan, 1, 2],
+                           'Year': [2024, 2024, np.nan, 2025.0]})
+        export_csv_gz(df, str(tmp_path))
+        assert os.path.isdir(tmp_path / 'Cluster=1' / 'Year=2024')
+        assert os.path.isdir(tmp_path / 'Cluster=__null__' / 'Year=2024')
+        assert os.path.isdir(tmp_path / 'Cluster=1' / 'Year=__null__')
+        assert len(read_partition(str(tmp_path))) == 4
+        part = read_partition(str(tmp_path), cluster=1)
+        assert sorted(part['Title']) == ['a', 'c']
+        assert part['Cluster'].dtype == 'Int64'
+        assert part['Year'].isna().sum() == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the figure script command lines
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import generate_figures  # noqa: E402
+import generate_figures_real_data  # noqa: E402
+
+
+@pytest.fixture(params=[generate_figures, generate_figures_real_data],
+                ids=['generate_figures', 'generate_figures_real_data'])
+def script(request, monkeypatch):
+    """Script con las figuras sustituidas por stubs que registran la llamada."""
+    module = request.param
+    calls = []
+    for name in list(module.FIGURES):
+        monkeypatch.setitem(module.FIGURES, name, lambda *a, _n=name: calls.append(_n))
+    module.calls = calls
+    yield module
+    del module.calls
+
+
+class TestFigureCli:
+    """Default and selected runs of both figure scripts."""
+
+    def test_no_arguments_renders_every_figure(self, script):
+        script.main([])
+        assert script.calls == list(script.FIGURES)
+
+    def test_selected_figures(self, script):
+        script.main(['fig2'])
+        assert script.calls == ['fig2']
+
+    def test_unknown_figure_is_usage_error(self, script, capsys):
+        with pytest.raises(SystemExit) as exc:
+            script.main(['fig9'])
+        assert exc.value.code == 2
+        assert 'fig9' in capsys.readouterr().err
+
+
+
+class TestAssignmentsOption:
+    """--assignments reads the export layout (Cluster / Year)."""
+
+    def test_export_directory_feeds_the_cube(self, tmp_path, monkeypatch):
+        import pandas as pd
+        from export_results import export_csv_gz
+        df = pd.DataFrame({'Title': list('abcd'), 'Cluster': [0, 0, 3, 3],
+                           'Year': [2023, 2025, 2025, 2025]})
+        export_csv_gz(df, str(tmp_path))
+        cubes = []
+        monkeypatch.setitem(generate_figures_real_data.FIGURES, 'fig2', cubes.append)
+        generate_figures_real_data.main(['fig2', '--assignments', str(tmp_path)])
+        assert cubes[0].at(2025).tolist()[:4] == [1, 0, 0, 2]
+
+
+class TestGrowthFigure:
+    """fig3 with declining clusters and clusters absent in the start year."""
+
+    def test_negative_growth_and_excluded_clusters(self, tmp_path, monkeypatch, capsys):
+        pytest.importorskip('matplotlib')
+        from trends import CountCube
+        monkeypatch.setattr(generate_figures_real_data, 'FIGURES_DIR', str(tmp_path))
+        cube = CountCube([[10, 5, 2], [0, 3, 4], [8, 6, 4]], [2023, 2024, 2025],
+                         names=['a', 'b', 'c'])
+        generate_figures_real_data.fig3_growth_rate(cube)
+        assert (tmp_path / 'fig3_crecimiento_clusters.png').exists()
+        assert 'Excluidos (0 documentos en 2023): b' in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the inverted index / BM25 search
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from search_index import InvertedIndex, main, normalize_query  # noqa: E402
+
+CORPUS = [
+    'feder learn privaci hospit',
+    'deep learn imag segment',
+    'feder learn feder model',
+    'larg languag model clinic note',
+    'radiom imag featur',
+]
+CLUSTERS = [4, 10, 4, 7, 12]
+YEARS = [2023, 2024, 2025, 2025, 2023]
+
+
+@pytest.fixture
+def index():
+    return InvertedIndex.build(CORPUS, clusters=CLUSTERS, years=YEARS)
+
+
+class TestIndexStructure:
+    """Tests for the CSR postings layout."""
+
+    def test_vocab_sorted(self, index):
+        assert list(index.vocab) == sorted(index.vocab)
+
+    def test_postings_sorted_per_term(self, index):
+        for t in range(len(index.vocab)):
+            ids = index.postings[index.offsets[t]:index.offsets[t + 1]]
+            assert np.all(np.diff(ids) > 0)
+
+    def test_missing_facets_are_minus_one(self):
+        index = InvertedIndex.build(CORPUS[:3], clusters=[4, np.nan, 4],
+                                    years=[2023.0, None, np.nan])
+        assert index.cluster.tolist() == [4, -1, 4]
+        assert index.year.tolist() == [2023, -1, -1]
+
+    def test_term_frequencies(self, index):
+        ids, tf = index._postings('feder')
+        assert ids.tolist() == [0, 2]
+        assert tf.tolist() == [1, 2]
+
+
+class TestQueries:
+    """Tests for boolean and BM25 queries with facets."""
+
+    def test_docs_with_all_terms(self, index):
+        assert index.docs_with('feder learn').tolist() == [0, 2]
+
+    def test_docs_with_cluster_facet(self, index):
+        assert index.docs_with('learn', cluster=10).tolist() == [1]
+        assert index.docs_with('imag', year=[2023]).tolist() == [4]
+
+    def test_unknown_term(self, index):
+        assert index.docs_with('blockchain').tolist() == []
+        assert len(index.search('blockchain')[0]) == 0
+
+    def test_bm25_ranks_higher_tf_first(self, index):
+        doc_ids, scores = index.search('feder', k=5)
+        assert doc_ids.tolist() == [2, 0]
+        assert scores[0] > scores[1] > 0
+
+    def test_search_top_k(self, index):
+        doc_ids, _ = index.search('learn imag', k=2)
+        assert len(doc_ids) == 2
+        assert doc_ids[0] == 1
+
+    def test_free_text_query_is_normalized(self, index):
+        assert normalize_query('Federated Learning!') == 'feder learn'
+        doc_ids, _ = index.search(normalize_query('federated learning'), cluster=4)
+        assert sorted(doc_ids.tolist()) == [0, 2]
+
+    def test_cli_query(self, index, tmp_path, capsys):
+        index.save(str(tmp_path))
+        main(['query', str(tmp_path), 'federated learning', '--cluster', '4'])
+        assert capsys.readouterr().out.startswith('2\t')
+
+    def test_facet_counts(self, index):
+        counts = index.facet_counts(index.docs_with('learn'))
+        assert counts['cluster'] == {4: 2, 10: 1}
+
+
+class TestPersistence:
+    """Tests for save / memory-mapped load."""
+
+    def test_roundtrip_mmap(self, index, tmp_path):
+        index.save(str(tmp_path))
+        loaded = InvertedIndex.load(str(tmp_path))
+        assert isinstance(loaded.postings, np.memmap)
+        assert loaded.docs_with('feder learn', cluster=4).tolist() == [0, 2]
+        np.testing.assert_allclose(loaded.search('model')[1], index.search('model')[1])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the offline corpus preprocessing
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import random
+import subprocess
+import sys
+import warnings
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import text_processing as tp  # noqa: E402
+from nlp_resources import STOPWORDS  # noqa: E402
+
+
+class TestResources:
+    """Tests for the precompiled stopword artifact."""
+
+    def test_stopwords_frozenset(self):
+        assert isinstance(STOPWORDS, frozenset)
+        assert {'the', 'and', 'with', 'between'} <= STOPWORDS
+
+    def test_import_is_lazy(self):
+        """Importing the module must not pull in nltk or unidecode."""
+        code = ("import sys, text_processing; "
+                "assert 'nltk' not in sys.modules and 'unidecode' not in sys.modules")
+        subprocess.run([sys.executable, '-c', code], check=True,
+                       cwd=os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+
+class TestProcessCorpus:
+    """Tests for processCorpus equivalence."""
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_removes_urls_emails_numbers(self):
+        corpus = ['Deep learning in 120 patients, see http://x.org or a@b.com.']
+        assert tp.process_corpus(corpus) == ['deep learning patients see']
+
+    def test_warns_without_custom_list(self, monkeypatch):
+        with pytest.warns(UserWarning, match='stop_words_1.txt'):
+            tp.process_corpus(['deep learning'])
+        monkeypatch.setattr(tp, 'CUSTOM_SOURCES', ('stop_words_1.txt',))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert tp.process_corpus(['deep learning']) == ['deep learning']
+
+    def test_removes_short_and_long_tokens(self):
+        assert tp.two_letters(['ai', 'model', 'x' * 22]) == ['ai', 'x' * 22]
+        assert tp.clean_document('AI model ' + 'x' * 22) == 'model'
+
+    def test_ascii_output(self):
+        assert tp.clean_document('Análisis clínico') == 'analisis clinico'
+
+
+class TestTokenize:
+    """Tests for word_tokenize equivalence on cleaned text."""
+
+    def test_contractions_split_like_nltk(self):
+        assert tp.tokenize('methods cannot generalize') == ['methods', 'can', 'not', 'generalize']
+        assert tp.tokenize('we wanna gonna') == ['we', 'wan', 'na', 'gon', 'na']
+        assert tp.clean_document('These methods cannot generalize') == 'methods generalize'
+
+    def test_unicode_punctuation_stays_attached(self):
+        assert tp.tokenize('test… “quoted” a–b') == ['test…', '“', 'quoted', '”', 'a', '–', 'b']
+
+    def test_matches_nltk_word_tokenizer(self):
+        destructive = pytest.importorskip('nltk.tokenize.destructive')
+        nltk_tokenize = destructive.NLTKWordTokenizer().tokenize
+        rng = random.Random(0)
+        pieces = ['cannot', 'gonna', 'wanna', 'gotta', 'gimme', 'lemme', 'canned', 'notable',
+                  'análisis', 'test…', '“', '”', '‘', '’', '«', '»', '—', '–', '·', '°',
+                  'ai', 'model', ' ', '  ', '\n']
+        for _ in range(500):
+            text = ''.join(rng.choice(pieces) + rng.choice(['', ' ']) for _ in range(12))
+            assert tp.tokenize(text) == nltk_tokenize(text), text
+
+
+class TestNormalizeCorpus:
+    """Tests for normalizeCorpus (Snowball stemming)."""
+
+    def test_stems(self):
+        corpus = tp.normalize_corpus(['studies learning models'])
+        assert corpus == ['studi learn model']
+
+    def test_notebook_aliases(self):
+        assert tp.normalizeCorpus is tp.normalize_corpus
+        assert tp.processCorpus is tp.process_corpus
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
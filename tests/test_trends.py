@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the cluster x period trend engine
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from trends import CountCube  # noqa: E402
+from test_data_integrity import CLUSTER_DATA  # noqa: E402
+
+
+@pytest.fixture
+def cube():
+    return CountCube.from_summary(CLUSTER_DATA)
+
+
+class TestCubeConstruction:
+    """Tests for building the count cube."""
+
+    def test_from_assignments_bincount(self):
+        cube = CountCube.from_assignments([0, 0, 1, 2, 2, 2], [2023, 2025, 2023, 2025, 2025, 2023])
+        assert cube.periods.tolist() == [2023, 2024, 2025]
+        assert cube.counts.tolist() == [[1, 0, 1], [1, 0, 0], [1, 0, 2]]
+
+    def test_cluster_ids_out_of_range(self):
+        with pytest.raises(ValueError, match='fuera de'):
+            CountCube.from_assignments([0, 15], [2023, 2025], n_clusters=15)
+        with pytest.raises(ValueError, match='fuera de'):
+            CountCube.from_assignments([-1, 2], [2023, 2025])
+
+    def test_missing_years_rejected(self):
+        with pytest.raises(ValueError, match='año: 1 valores ausentes'):
+            CountCube.from_assignments([0, 1], [2023, np.nan])
+
+    def test_quarters_and_yearly_rollup(self):
+        cube = CountCube.from_assignments([0, 0, 1, 1], [2023, 2023, 2024, 2024],
+                                          quarters=[1, 4, 2, 2])
+        assert cube.freq == 'quarter'
+        assert cube.counts.shape == (2, 6)
+        assert cube.period_label(cube.periods[-1]) == '2024-Q2'
+        assert cube.to_yearly().counts.tolist() == [[2, 0], [0, 2]]
+
+    def test_from_summary_matches_table(self, cube):
+        assert cube.totals().tolist() == CLUSTER_DATA['n']
+        assert cube.at(2023).tolist() == CLUSTER_DATA['y2023']
+
+
+class TestMetrics:
+    """Tests for shares, growth, CAGR and rankings."""
+
+    def test_growth_reproduces_published_values(self, cube):
+        assert np.round(cube.growth(2023, 2025)).astype(int).tolist() == CLUSTER_DATA['growth']
+
+    def test_shares_sum_to_100(self, cube):
+        np.testing.assert_allclose(cube.shares().sum(axis=0), 100)
+
+    def test_cagr(self):
+        cube = CountCube([[100, 150, 225]], [2023, 2024, 2025])
+        np.testing.assert_allclose(cube.cagr(2023, 2025), [50.0])
+
+    def test_rolling_growth(self):
+        cube = CountCube([[100, 150, 75]], [2023, 2024, 2025])
+        np.testing.assert_allclose(cube.rolling_growth(1), [[np.nan, 50.0, -50.0]])
+
+    def test_emerging_top3(self, cube):
+        top = cube.emerging(2023, 2025, k=3)
+        assert top['name'].tolist() == [
+            'NLP & LLMs', 'CT Radiomics', 'Clinical Studies (Retrospective)']
+
+    def test_window(self, cube):
+        sub = cube.window(2024, 2025)
+        assert sub.periods.tolist() == [2024, 2025]
+        with pytest.raises(KeyError):
+            sub.at(2023)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the vectorized assignment-table validation
+AI in Clinical Research Scoping Review
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from validate_assignments import load_assignments, main, validate_assignments  # noqa: E402
+from test_data_integrity import CLUSTER_DATA, EXPECTED_TOTAL  # noqa: E402
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_data.csv')
+
+
+def _assignments_from_summary(summary):
+    """Tabla de asignaciones sintética consistente con CLUSTER_DATA."""
+    clusters, years = [], []
+    for c, (n, y23, y25) in enumerate(zip(summary['n'], summary['y2023'], summary['y2025'])):
+        clusters += [c] * n
+        years += [2023] * y23 + [2025] * y25 + [2024] * (n - y23 - y25)
+    return pd.DataFrame({'doc_id': [f'DOC{i:05d}' for i in range(len(clusters))],
+                         'cluster_id': clusters, 'year': years})
+
+
+def _check(report, name):
+    return next(c for c in report.checks if c.name.startswith(name))
+
+
+class TestValidAssignments:
+    """Valid tables pass every invariant."""
+
+    def test_sample_data(self):
+        df = load_assignments(SAMPLE_CSV)
+        report = validate_assignments(df, expected_total=100, year_range=(2023, 2025))
+        assert report.passed, [c.message for c in report.failures]
+
+    def test_partitioned_export_directory(self, tmp_path):
+        from export_results import export_csv_gz
+        df = _assignments_from_summary(CLUSTER_DATA).rename(
+            columns={'cluster_id': 'Cluster', 'year': 'Year'})
+        export_csv_gz(df, str(tmp_path))
+        assert main([str(tmp_path), '--expected-total', str(EXPECTED_TOTAL),
+                     '--summary-from-figures']) == 0
+        loaded = load_assignments(str(tmp_path), ['doc_id', 'cluster_id', 'year'])
+        assert list(loaded.columns) == ['doc_id', 'cluster_id', 'year']
+
+    def test_manuscript_table_consistent(self):
+        df = _assignments_from_summary(CLUSTER_DATA)
+        report = validate_assignments(df, expected_total=EXPECTED_TOTAL, summary=CLUSTER_DATA)
+        assert report.passed, [c.message for c in report.failures]
+        assert report.counts.tolist() == CLUSTER_DATA['n']
+
+
+class TestInvalidAssignments:
+    """Each violated invariant is reported with the offending rows."""
+
+    @pytest.fixture
+    def df(self):
+        return _assignments_from_summary(CLUSTER_DATA)
+
+    def test_duplicate_doc_ids(self, df):
+        df.loc[10, 'doc_id'] = df.loc[3, 'doc_id']
+        check = _check(validate_assignments(df), 'doc ids')
+        assert not check.passed
+        assert check.examples.index.tolist() == [3, 10]
+
+    def test_negative_and_missing_years(self, df):
+        df['year'] = df['year'].astype(float)
+        df.loc[5, 'year'] = -2023
+        df.loc[7, 'year'] = np.nan
+        check = _check(validate_assignments(df), 'años')
+        assert not check.passed
+        assert check.examples.index.tolist() == [5, 7]
+
+    def test_total_mismatch(self, df):
+        report = validate_assignments(df.iloc[1:], expected_total=EXPECTED_TOTAL)
+        assert not _check(report, 'total').passed
+
+    def test_growth_mismatch(self, df):
+        summary = dict(CLUSTER_DATA, growth=list(CLUSTER_DATA['growth']))
+        summary['growth'][7] = 100
+        check = _check(validate_assignments(df, summary=summary), 'crecimiento')
+        assert not check.passed
+        assert check.examples['name'].tolist() == ['NLP & LLMs']
+
+    def test_reassigned_documents_break_counts(self, df):
+        df.loc[df['cluster_id'] == 14, 'cluster_id'] = 0
+        report = validate_assignments(df, summary=CLUSTER_DATA)
+        assert not _check(report, 'conteos por clúster').passed
+        assert not _check(report, 'porcentajes').passed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])